@@ -0,0 +1,228 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from heapq import merge
+from itertools import accumulate
+from operator import itemgetter
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from match import Match
+from match_map import MatchMap
+from match_map_player import MatchMapPlayer
+from utils import intern_name
+
+# Stats that are aggregated for each map a player or team played
+AGGREGATE_STATS: Tuple[str, ...] = ("hltv_rating", "adr", "kast_percent", "first_kill_diff")
+
+
+class AggregateStats:
+    """
+    A player's or team's stats over a window of maps. Ratings, ADR and KAST
+    are averages per map; the first kill differential is the total.
+    """
+
+    __slots__ = ("maps", "hltv_rating", "adr", "kast_percent", "first_kill_diff")
+
+    def __init__(self, maps: int, sums: Dict[str, float]):
+        self.maps: int = maps
+        self.hltv_rating: Optional[float] = sums["hltv_rating"] / maps if maps > 0 else None
+        self.adr: Optional[float] = sums["adr"] / maps if maps > 0 else None
+        self.kast_percent: Optional[float] = sums["kast_percent"] / maps if maps > 0 else None
+        self.first_kill_diff: float = sums["first_kill_diff"]
+
+    def __str__(self):
+        return ", ".join(f"{name}={getattr(self, name)}" for name in self.__slots__)
+
+
+class _RunningAggregate:
+    """
+    One value per map for each stat, stored as prefix sums in date order, so
+    the sum over any range of maps is the difference of two entries.
+
+    Maps normally arrive newest last and are appended. Older maps are buffered
+    and merged in, rebuilding the prefix sums once, before the next query, so
+    adding maps in any order takes O(n log n) overall.
+    """
+
+    def __init__(self):
+        self.timestamps = array("d")
+        self.values: Dict[str, array] = {name: array("d") for name in AGGREGATE_STATS}
+        self.prefix_sums: Dict[str, array] = {name: array("d", [0]) for name in AGGREGATE_STATS}
+        self._pending: List[Tuple[float, Tuple[float, ...]]] = []
+
+    def __len__(self) -> int:
+        return len(self.timestamps) + len(self._pending)
+
+    def add(self, timestamp: float, values: Dict[str, float]):
+        if len(self._pending) == 0 and (len(self.timestamps) == 0 or timestamp >= self.timestamps[-1]):
+            self.timestamps.append(timestamp)
+            for name, prefix_sums in self.prefix_sums.items():
+                self.values[name].append(values[name])
+                prefix_sums.append(prefix_sums[-1] + values[name])
+            return
+        self._pending.append((timestamp, tuple(values[name] for name in AGGREGATE_STATS)))
+
+    def _merge_pending(self):
+        if len(self._pending) == 0:
+            return
+        self._pending.sort(key=itemgetter(0))
+        # Stored maps come before pending maps with the same date, as if each
+        # pending map had been inserted after them
+        stored = zip(self.timestamps, zip(*(self.values[name] for name in AGGREGATE_STATS)))
+        merged = list(merge(stored, self._pending, key=itemgetter(0)))
+        self._pending = []
+        self.timestamps = array("d", (timestamp for timestamp, _ in merged))
+        for i, name in enumerate(AGGREGATE_STATS):
+            self.values[name] = array("d", (map_values[i] for _, map_values in merged))
+            self.prefix_sums[name] = array("d", accumulate(self.values[name], initial=0))
+
+    def get_stats(
+        self,
+        last_n: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> AggregateStats:
+        self._merge_pending()
+        start = 0 if start_date is None else bisect_left(self.timestamps, start_date.timestamp())
+        end = len(self.timestamps) if end_date is None else bisect_right(self.timestamps, end_date.timestamp())
+        if last_n is not None:
+            start = max(start, end - last_n)
+        end = max(start, end)
+        sums = {name: prefix_sums[end] - prefix_sums[start] for name, prefix_sums in self.prefix_sums.items()}
+        return AggregateStats(maps=end - start, sums=sums)
+
+
+class AggregateEngine:
+    """
+    Running per-map stats by player and team, overall and per map name. Maps
+    are added incrementally as matches are crawled, and window queries (the
+    last N maps, or a date range) are answered from prefix sums without
+    rescanning the history.
+    """
+
+    def __init__(self, matches: Iterable[Match] = ()):
+        """
+        Initialize a new AggregateEngine object.
+
+        Parameters
+        ----------
+        matches : Iterable[Match]
+            Matches to add to the engine.
+        """
+        self._aggregates: Dict[Hashable, _RunningAggregate] = {}
+        self._hltv_match_map_ids: Set[int] = set()
+        for match in matches:
+            self.add_match(match)
+
+    def _add(self, key: Hashable, timestamp: float, values: Dict[str, float]):
+        aggregate = self._aggregates.get(key)
+        if aggregate is None:
+            aggregate = self._aggregates[key] = _RunningAggregate()
+        aggregate.add(timestamp, values)
+
+    def add_match(self, match: Match):
+        """
+        Add every map of a match. Skipped matches are ignored.
+        """
+        if match.skipped:
+            return
+        for match_map in match.match_maps:
+            self.add_match_map(match_map, match.match_date)
+
+    def add_match_map(self, match_map: MatchMap, match_date: datetime):
+        """
+        Add a map's player stats (both sides). A map that was already added is ignored.
+        Maps without a map name are only added to the overall (not per-map)
+        aggregates, and teams without an HLTV team ID only to their players'.
+        """
+        if match_map.hltv_match_map_id in self._hltv_match_map_ids:
+            return
+        self._hltv_match_map_ids.add(match_map.hltv_match_map_id)
+        timestamp = match_date.timestamp()
+        map_name = intern_name(match_map.map_name)
+        for team_num in (1, 2):
+            players = match_map.get_map_players(team_num=team_num, side="Both")
+            if len(players) == 0:
+                continue
+            player_values = [_get_player_values(player) for player in players]
+            for player, values in zip(players, player_values):
+                self._add(("player", player.hltv_player_id), timestamp, values)
+                if map_name is not None:
+                    self._add(("player_map", player.hltv_player_id, map_name), timestamp, values)
+            hltv_team_id = getattr(match_map, f"team{team_num}_hltv_team_id")
+            if hltv_team_id is None:
+                continue
+            team_values = _get_team_values(player_values)
+            self._add(("team", hltv_team_id), timestamp, team_values)
+            if map_name is not None:
+                self._add(("team_map", hltv_team_id, map_name), timestamp, team_values)
+
+    def _get_stats(self, key: Hashable, **window) -> AggregateStats:
+        aggregate = self._aggregates.get(key)
+        if aggregate is None:
+            return AggregateStats(maps=0, sums={name: 0 for name in AGGREGATE_STATS})
+        return aggregate.get_stats(**window)
+
+    def get_player_stats(
+        self,
+        hltv_player_id: int,
+        map_name: Optional[str] = None,
+        last_n: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> AggregateStats:
+        """
+        Get a player's stats, optionally on one map only.
+
+        Parameters
+        ----------
+        hltv_player_id : int
+            HLTV's player ID.
+
+        map_name : Optional[str]
+            Only include maps with this name.
+
+        last_n : Optional[int]
+            Only include the player's last N maps (within the date range, if given).
+
+        start_date : Optional[datetime]
+            Only include maps played on or after this date.
+
+        end_date : Optional[datetime]
+            Only include maps played on or before this date.
+        """
+        key = ("player", hltv_player_id) if map_name is None else ("player_map", hltv_player_id, map_name)
+        return self._get_stats(key, last_n=last_n, start_date=start_date, end_date=end_date)
+
+    def get_team_stats(
+        self,
+        hltv_team_id: int,
+        map_name: Optional[str] = None,
+        last_n: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> AggregateStats:
+        """
+        Get a team's stats, optionally on one map only. Each map counts the
+        average rating, ADR and KAST of the team's players and their combined
+        first kill differential. Takes the same window arguments as
+        `get_player_stats`.
+        """
+        key = ("team", hltv_team_id) if map_name is None else ("team_map", hltv_team_id, map_name)
+        return self._get_stats(key, last_n=last_n, start_date=start_date, end_date=end_date)
+
+
+def _get_player_values(player: MatchMapPlayer) -> Dict[str, float]:
+    return {
+        "hltv_rating": player.hltv_rating,
+        "adr": player.adr,
+        "kast_percent": player.kast_percent,
+        "first_kill_diff": player.first_kills - player.first_deaths,
+    }
+
+
+def _get_team_values(player_values: List[Dict[str, float]]) -> Dict[str, float]:
+    team_values = {name: sum(values[name] for values in player_values) for name in AGGREGATE_STATS}
+    for name in ("hltv_rating", "adr", "kast_percent"):
+        team_values[name] /= len(player_values)
+    return team_values
@@ -0,0 +1,187 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set
+
+from fetcher import AsyncFetcher, FetchError, check_page_source
+from match import Match
+from metrics import Metrics
+from page_cache import PageCache
+from parsers import load_match_map_pages, parse_match_page_without_maps, parse_results_page
+from rate_limiter import RateLimiter
+from result import Result
+from utils import get_page_type, get_results_url
+
+
+class AsyncHltvClient:
+    """
+    An asyncio HLTV API client. Pages are fetched without blocking the event
+    loop, with a cap on the number of requests in flight, and parsed on an
+    executor so parsing does not stall the loop.
+    """
+
+    def __init__(
+        self,
+        fetcher: Optional[AsyncFetcher] = None,
+        max_in_flight: int = 4,
+        requests_per_second: float = 1,
+        page_cache: Optional[PageCache] = None,
+        parse_executor: Optional[Executor] = None,
+        max_retries: int = 4,
+        metrics: Optional[Metrics] = None,
+        max_requests_per_second: float = 2,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        Initialize a new AsyncHltvClient object.
+
+        Parameters
+        ----------
+        fetcher : Optional[AsyncFetcher]
+            The backend used to fetch pages. Defaults to an AsyncHttpFetcher. Use
+            ThreadedFetcher to wrap a blocking fetcher such as ChromeFetcher.
+
+        max_in_flight : int
+            Maximum number of page requests in flight at once.
+
+        requests_per_second : float
+            Number of page requests per second to start with. The rate
+            rises after successful requests, up to `max_requests_per_second`,
+            and is lowered, with requests paused, when HLTV fails or blocks a request.
+
+        page_cache : Optional[PageCache]
+            Cache to read pages from before fetching them.
+
+        parse_executor : Optional[Executor]
+            Executor to parse pages on. Defaults to a thread pool; a
+            ProcessPoolExecutor can be passed to parse on several cores.
+
+        max_retries : int
+            Number of times to retry a page after a failed or blocked request.
+
+        metrics : Optional[Metrics]
+            Collects fetch and parse timings and crawl counters.
+
+        max_requests_per_second : float
+            Highest rate that successful requests can raise the rate to.
+
+        rate_limiter : Optional[RateLimiter]
+            Rate limiter to use instead of creating one from the rates above.
+            Share one instance between clients to apply a global limit.
+        """
+        if fetcher is None:
+            # Imported here so aiohttp is only loaded when it is used
+            from async_http_fetcher import AsyncHttpFetcher
+
+            fetcher = AsyncHttpFetcher(pool_size=max_in_flight)
+        self.fetcher: AsyncFetcher = fetcher
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(requests_per_second, max_requests_per_second=max_requests_per_second)
+        self.rate_limiter: RateLimiter = rate_limiter
+        self.page_cache = page_cache
+        self.max_retries = max_retries
+        self.metrics: Metrics = metrics or Metrics()
+        self.max_in_flight: int = max_in_flight
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._owns_executor = parse_executor is None
+        self._parse_executor: Executor = parse_executor or ThreadPoolExecutor()
+
+    async def close(self):
+        await self.fetcher.close()
+        if self._owns_executor:
+            self._parse_executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncHltvClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _get_page_source(self, url: str) -> str:
+        if self.page_cache is not None:
+            page_source = await asyncio.to_thread(self.page_cache.get, url)
+            if page_source is not None:
+                self.metrics.increment("cache_hits", page_type=get_page_type(url))
+                return page_source
+        page_source = await self._fetch_page_source(url)
+        if self.page_cache is not None:
+            await asyncio.to_thread(self.page_cache.set, url, page_source)
+        return page_source
+
+    async def _fetch_page_source(self, url: str) -> str:
+        page_type = get_page_type(url)
+        attempt = 0
+        while True:
+            async with self._in_flight:
+                with self.metrics.timer("rate_limit_wait", page_type=page_type):
+                    await self.rate_limiter.acquire_async()
+                try:
+                    with self.metrics.timer("fetch", page_type=page_type):
+                        page_source = await self.fetcher.get_page_source(url)
+                    check_page_source(url, page_source)
+                except FetchError as e:
+                    self.rate_limiter.record_failure()
+                    self.metrics.increment("fetch_errors", page_type=page_type, error=type(e).__name__)
+                    if not e.retryable or attempt >= self.max_retries:
+                        raise
+                    attempt += 1
+                    self.metrics.increment("retries", page_type=page_type)
+                    continue
+            self.rate_limiter.record_success()
+            self.metrics.increment("pages_fetched", page_type=page_type)
+            return page_source
+
+    async def _parse(self, entity: str, parse: Callable[..., Any], *args: Any) -> Any:
+        # Includes any time spent waiting for a free executor worker
+        with self.metrics.timer("parse", entity=entity):
+            return await asyncio.get_running_loop().run_in_executor(self._parse_executor, parse, *args)
+
+    async def get_results(self, offset_start: int = 0, offset_end: int = 0) -> List[Result]:
+        offsets = range(offset_start, offset_end + 1, 100)
+        page_sources = await asyncio.gather(
+            *(self._get_page_source(get_results_url(offset)) for offset in offsets)
+        )
+        results: List[Result] = []
+        parsed_pages = await asyncio.gather(*(self._parse("results", parse_results_page, s) for s in page_sources))
+        for page_results in parsed_pages:
+            results.extend(page_results)
+        return results
+
+    async def get_match(self, match_url: str) -> Match:
+        """
+        Get a fully loaded match. Its map stats pages are fetched concurrently.
+        """
+        match_source = await self._get_page_source(match_url)
+        match: Match = await self._parse("match", parse_match_page_without_maps, match_source, match_url)
+        if match.skipped:
+            # Skipped matches (forfeits, showmatches, etc.) have no map stats to fetch
+            self.metrics.increment("skipped_matches")
+            return match
+        map_urls = match.match_map_urls
+        map_page_sources = await asyncio.gather(*(self._get_page_source(map_url) for map_url in map_urls))
+        map_sources: Dict[str, str] = dict(zip(map_urls, map_page_sources))
+        return await self._parse("match_map", load_match_map_pages, match, map_sources)
+
+    async def iter_matches(self, match_urls: Iterable[str]) -> AsyncIterator[Match]:
+        """
+        Fetch matches concurrently, yielding each Match as soon as it is loaded.
+        Matches are not necessarily yielded in the order of `match_urls`.
+        At most `max_in_flight` matches are fetched at a time, and new ones are
+        started as matches are yielded, so a slow consumer slows the crawl.
+        """
+        match_url_iter = iter(match_urls)
+        pending: Set["asyncio.Future[Match]"] = set()
+        try:
+            while True:
+                while len(pending) < self.max_in_flight:
+                    match_url = next(match_url_iter, None)
+                    if match_url is None:
+                        break
+                    pending.add(asyncio.ensure_future(self.get_match(match_url)))
+                if len(pending) == 0:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
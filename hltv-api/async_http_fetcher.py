@@ -0,0 +1,60 @@
+import aiohttp
+import asyncio
+from typing import Dict, Optional
+
+from fetcher import AsyncFetcher, FetchError
+from http_fetcher import DEFAULT_HEADERS
+
+
+class AsyncHttpFetcher(AsyncFetcher):
+    """
+    Fetches pages with non-blocking HTTP requests over a pool of keep-alive
+    connections.
+    """
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, timeout: float = 15, pool_size: int = 10):
+        """
+        Initialize a new AsyncHttpFetcher object.
+
+        Parameters
+        ----------
+        headers : Optional[Dict[str, str]]
+            Headers to send with every request. Overrides the matching DEFAULT_HEADERS entries.
+
+        timeout : float
+            Maximum number of seconds to wait for a response.
+
+        pool_size : int
+            Maximum number of open connections.
+        """
+        self.headers: Dict[str, str] = {**DEFAULT_HEADERS, **(headers or {})}
+        self.timeout: float = timeout
+        self.pool_size: int = pool_size
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # The session must be created inside a running event loop
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get_page_source(self, url: str) -> str:
+        try:
+            async with self._get_session().get(url) as response:
+                if response.status != 200:
+                    raise FetchError(
+                        f"Request for {url} returned status {response.status}",
+                        retryable=response.status != 404,
+                    )
+                return await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise FetchError(f"Request for {url} failed: {e}") from e
@@ -0,0 +1,256 @@
+"""
+Benchmark the page parsers against the saved HTML pages in `fixtures/`.
+
+Usage: python benchmark.py [--iterations N] [--update-expected]
+
+Reports the parse time per page and the number of parsed objects per second
+for each fixture. No browser or network access is needed. Before timing, the
+values parsed from each fixture are compared with the expected values in
+`fixtures/expected/`; a parser that breaks on a fixture or returns different
+values (e.g. after updating it for an HLTV layout change) makes the benchmark
+fail. Run with `--update-expected` to rewrite the expected values after
+checking that the new values are correct.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+from dom import parse_html
+from match import Match, get_match_map_urls
+from match_map import MatchMap
+from parsers import (
+    parse_event_page,
+    parse_match_map_page,
+    parse_match_page_without_maps,
+    parse_player_page,
+    parse_results_page,
+    parse_team_page,
+)
+from store import TABLES
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+EXPECTED_DIR = os.path.join(FIXTURES_DIR, "expected")
+
+# Fixture file name -> (page type, URL the page was saved from)
+FIXTURE_URLS: Dict[str, Tuple[str, str]] = {
+    "results.html": ("results", "https://www.hltv.org/results?offset=0"),
+    "match_bo1.html": (
+        "match",
+        "https://www.hltv.org/matches/2363126/ence-vs-apeks-blasttv-paris-major-2023-europe-rmr-b",
+    ),
+    "match_bo3.html": (
+        "match",
+        "https://www.hltv.org/matches/2363127/9ine-vs-g2-blasttv-paris-major-2023-europe-rmr-b",
+    ),
+    "match_forfeit.html": (
+        "match",
+        "https://www.hltv.org/matches/2363100/og-vs-mouz-blasttv-paris-major-2023-europe-rmr-b",
+    ),
+    "match_showmatch.html": (
+        "match",
+        "https://www.hltv.org/matches/2363090/vitality-vs-faze-blasttv-paris-major-2023-europe-rmr-b",
+    ),
+    "mapstats_bo3_map1.html": ("match_map", "https://www.hltv.org/stats/matches/mapstatsid/154582/9ine-vs-g2"),
+    "mapstats_bo3_map2.html": ("match_map", "https://www.hltv.org/stats/matches/mapstatsid/154583/9ine-vs-g2"),
+    "mapstats_bo3_map3.html": ("match_map", "https://www.hltv.org/stats/matches/mapstatsid/154584/9ine-vs-g2"),
+    # Some map stat pages do not have flash assists
+    # https://www.hltv.org/stats/matches/mapstatsid/151341/ination-vs-apeks
+    "mapstats_no_flash_assists.html": (
+        "match_map",
+        "https://www.hltv.org/stats/matches/mapstatsid/151341/ence-vs-apeks",
+    ),
+    "team.html": ("team", "https://www.hltv.org/team/5995/g2"),
+    "player.html": ("player", "https://www.hltv.org/player/3741/niko"),
+    "event.html": ("event", "https://www.hltv.org/events/7259/blast-tv-paris-major-2023-europe-rmr-b"),
+}
+
+# Parsers of the profile page types, which produce a single object per page
+PROFILE_PARSERS: Dict[str, Callable[[str, str], Any]] = {
+    "team": parse_team_page,
+    "player": parse_player_page,
+    "event": parse_event_page,
+}
+
+
+def read_fixture(file_name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, file_name), encoding="utf-8") as fixture_file:
+        return fixture_file.read()
+
+
+def _count_match_objects(match: Match) -> int:
+    # The match itself and its pick/bans; map pages are benchmarked separately
+    if match.skipped:
+        return 1
+    return 1 + len(match.pick_bans)
+
+
+def _count_match_map_objects(match_map: MatchMap) -> int:
+    players = sum(
+        len(match_map.get_map_players(team_num=team_num, side=side))
+        for team_num in (1, 2)
+        for side in ("Both", "T", "CT")
+    )
+    return 1 + players + len(match_map.round_outcomes)
+
+
+def _get_parser(page_type: str, url: str) -> Callable[[str], int]:
+    # Each parser parses a page fully and returns the number of objects it produced.
+    if page_type == "results":
+        return lambda source: len(parse_results_page(source))
+    if page_type == "match":
+        # Map stats pages are not loaded; only the match page itself is parsed
+        return lambda source: _count_match_objects(parse_match_page_without_maps(source, url=url))
+    if page_type in PROFILE_PARSERS:
+        parse_profile = PROFILE_PARSERS[page_type]
+        return lambda source: 1 if parse_profile(source, url) is not None else 0
+    return lambda source: _count_match_map_objects(parse_match_map_page(source, url=url, match_id=0))
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # Dates are parsed in local time; compare them in UTC so the expected
+        # values do not depend on the time zone the benchmark runs in
+        return datetime.fromtimestamp(value.timestamp(), timezone.utc).isoformat()
+    return value
+
+
+def _get_record_values(record: Any, table: str) -> Dict[str, Any]:
+    return {name: _to_json_value(getattr(record, name)) for name in TABLES[table]}
+
+
+def get_parsed_values(file_name: str) -> Dict[str, Any]:
+    """
+    Parse a fixture fully and get its parsed values, with the same fields as
+    the tables of `store.TABLES` (all fields for teams, players and events).
+    """
+    page_type, url = FIXTURE_URLS[file_name]
+    source = read_fixture(file_name)
+    if page_type == "results":
+        return {"results": [_get_record_values(result, "results") for result in parse_results_page(source)]}
+    if page_type == "match":
+        match = parse_match_page_without_maps(source, url=url)
+        if match.skipped:
+            return {"skipped": True}
+        return {
+            "skipped": False,
+            "match": _get_record_values(match, "matches"),
+            "pick_bans": [_get_record_values(pick_ban, "pick_bans") for pick_ban in match.pick_bans],
+            "map_urls": get_match_map_urls(parse_html(source)),
+        }
+    if page_type in PROFILE_PARSERS:
+        profile = PROFILE_PARSERS[page_type](source, url)
+        return {page_type: {name: _to_json_value(getattr(profile, name)) for name in profile.__slots__}}
+    match_map = parse_match_map_page(source, url=url, match_id=0)
+    return {
+        "match_map": _get_record_values(match_map, "match_maps"),
+        "match_map_players": [
+            _get_record_values(player, "match_map_players")
+            for side in ("Both", "T", "CT")
+            for team_num in (1, 2)
+            for player in match_map.get_map_players(team_num=team_num, side=side)
+        ],
+        "round_outcomes": [
+            _get_record_values(round_outcome, "round_outcomes") for round_outcome in match_map.round_outcomes
+        ],
+    }
+
+
+def _get_expected_path(file_name: str) -> str:
+    return os.path.join(EXPECTED_DIR, os.path.splitext(file_name)[0] + ".json")
+
+
+def _diff_values(expected: Any, actual: Any, path: str) -> List[str]:
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return [
+            difference
+            for key in sorted(set(expected) | set(actual))
+            for difference in _diff_values(expected.get(key), actual.get(key), f"{path}.{key}")
+        ]
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{path}: expected {len(expected)} items, got {len(actual)}"]
+        return [
+            difference
+            for index, (expected_item, actual_item) in enumerate(zip(expected, actual))
+            for difference in _diff_values(expected_item, actual_item, f"{path}[{index}]")
+        ]
+    if expected != actual:
+        return [f"{path}: expected {expected!r}, got {actual!r}"]
+    return []
+
+
+def check_expected_values(update: bool = False) -> List[str]:
+    """
+    Compare the parsed values of every fixture with its expected values and
+    return the differences. With `update`, the expected values are rewritten
+    with the parsed values instead.
+    """
+    differences: List[str] = []
+    for file_name in FIXTURE_URLS:
+        values = get_parsed_values(file_name)
+        expected_path = _get_expected_path(file_name)
+        if update:
+            os.makedirs(EXPECTED_DIR, exist_ok=True)
+            with open(expected_path, "w", encoding="utf-8") as expected_file:
+                json.dump(values, expected_file, indent=2)
+                expected_file.write("\n")
+            continue
+        if not os.path.exists(expected_path):
+            differences.append(f"{file_name}: no expected values in {expected_path}")
+            continue
+        with open(expected_path, encoding="utf-8") as expected_file:
+            expected = json.load(expected_file)
+        differences.extend(_diff_values(expected, values, file_name))
+    return differences
+
+
+def run_benchmark(iterations: int) -> List[Tuple[str, str, float, float]]:
+    """
+    Parse every fixture `iterations` times and return rows of (file name,
+    page type, milliseconds per page, objects per second).
+    """
+    rows: List[Tuple[str, str, float, float]] = []
+    for file_name, (page_type, url) in FIXTURE_URLS.items():
+        source = read_fixture(file_name)
+        parse = _get_parser(page_type, url)
+        object_count = 0
+        start = perf_counter()
+        for _ in range(iterations):
+            object_count += parse(source)
+        elapsed = perf_counter() - start
+        rows.append((file_name, page_type, elapsed / iterations * 1000, object_count / elapsed))
+    return rows
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--iterations", type=int, default=50, help="Times to parse each fixture")
+    arg_parser.add_argument(
+        "--update-expected", action="store_true", help="Rewrite the expected values with the parsed values"
+    )
+    args = arg_parser.parse_args()
+
+    differences = check_expected_values(update=args.update_expected)
+    if len(differences) > 0:
+        print("Parsed values differ from the expected values:", file=sys.stderr)
+        for difference in differences:
+            print(f"  {difference}", file=sys.stderr)
+        sys.exit(1)
+
+    rows = run_benchmark(args.iterations)
+    print(f"{'fixture':<34}{'page type':<12}{'ms/page':>10}{'objects/s':>12}")
+    for file_name, page_type, ms_per_page, objects_per_second in rows:
+        print(f"{file_name:<34}{page_type:<12}{ms_per_page:>10.2f}{objects_per_second:>12.0f}")
+    print()
+    for page_type in ("results", "match", "match_map", "team", "player", "event"):
+        page_rows = [row for row in rows if row[1] == page_type]
+        mean_ms = sum(row[2] for row in page_rows) / len(page_rows)
+        print(f"{page_type:<12}{mean_ms:>10.2f} ms/page (mean of {len(page_rows)} fixtures)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+from collections import deque
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+from time import perf_counter
+from typing import Deque, Dict, Optional
+
+from driver_manager import DriverManager
+from fetcher import FetchError, Fetcher, check_page_source
+from metrics import Metrics
+from utils import get_page_type
+
+# The element that must be present before each page type can be parsed
+PAGE_READY_CLASS_NAMES: Dict[str, str] = {
+    "results": "result-con",
+    "match": "veto-box",
+    "match_map": "stats-table",
+    "team": "profile-team-name",
+    "player": "playerNickname",
+    "event": "event-hub-title",
+}
+
+
+class PageWait:
+    """
+    How long a single page load waited for its key element.
+    """
+
+    def __init__(self, url: str, page_type: str, seconds: float, timed_out: bool):
+        self.url: str = url
+        self.page_type: str = page_type
+        self.seconds: float = seconds
+        self.timed_out: bool = timed_out
+
+
+class ChromeFetcher(Fetcher):
+    """
+    Fetches pages with undetected Chrome and waits until each page's key
+    element is present, instead of sleeping for a fixed amount of time.
+    Chrome is started on the first fetch, and restarted as configured by its
+    DriverManager.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 15,
+        poll_frequency: float = 0.1,
+        metrics: Optional[Metrics] = None,
+        driver_manager: Optional[DriverManager] = None,
+        max_page_waits: int = 1000,
+    ):
+        """
+        Initialize a new ChromeFetcher object.
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum number of seconds to wait for a page's key element.
+
+        poll_frequency : float
+            Number of seconds between checks for the key element.
+
+        metrics : Optional[Metrics]
+            Collects driver start and page wait timings and WebDriver call counts.
+
+        driver_manager : Optional[DriverManager]
+            Starts and recycles the driver, e.g. headless or after a number of
+            pages. Defaults to one visible driver that is never recycled.
+
+        max_page_waits : int
+            Number of recent page waits to keep in `page_waits`. Timings of all
+            page waits are recorded in `metrics`.
+        """
+        self.timeout: float = timeout
+        self.poll_frequency: float = poll_frequency
+        self.page_waits: Deque[PageWait] = deque(maxlen=max_page_waits)
+        self.metrics: Metrics = metrics or Metrics()
+        self.driver_manager: DriverManager = driver_manager or DriverManager(metrics=self.metrics)
+
+    @property
+    def driver(self) -> WebDriver:
+        return self.driver_manager.driver
+
+    def quit(self):
+        self.driver_manager.quit()
+
+    def get_page_source(self, url: str) -> str:
+        """
+        Navigate to `url`, wait for the page to be ready, and return its source.
+        Raises FetchError if the key element never appears: BlockedPageError
+        for challenge pages, and not retryable for HLTV's "not found" pages.
+        """
+        page_type = get_page_type(url)
+        try:
+            self.metrics.increment("webdriver_calls", call="get")
+            self.driver.get(url)
+            try:
+                self._wait_until_ready(url, page_type, PAGE_READY_CLASS_NAMES.get(page_type))
+            except TimeoutException as e:
+                check_page_source(url, self._get_driver_page_source())
+                raise FetchError(f"Timed out waiting for {url} to load") from e
+            page_source = self._get_driver_page_source()
+        except WebDriverException as e:
+            # The browser crashed or hung; the next attempt gets a new driver
+            self.driver_manager.recycle(reason="error")
+            raise FetchError(f"Driver failed while loading {url}: {e.msg}") from e
+        self.driver_manager.page_done()
+        return page_source
+
+    def _get_driver_page_source(self) -> str:
+        self.metrics.increment("webdriver_calls", call="page_source")
+        return self.driver.page_source
+
+    def _wait_until_ready(self, url: str, page_type: str, class_name: Optional[str]):
+        if class_name is None:
+            return
+        start = perf_counter()
+        timed_out = False
+        try:
+            WebDriverWait(self.driver, self.timeout, poll_frequency=self.poll_frequency).until(
+                expected_conditions.presence_of_element_located((By.CLASS_NAME, class_name))
+            )
+        except TimeoutException:
+            timed_out = True
+            raise
+        finally:
+            seconds = perf_counter() - start
+            self.page_waits.append(PageWait(url, page_type, seconds, timed_out))
+            self.metrics.observe("page_wait", seconds, page_type=page_type)
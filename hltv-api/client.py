@@ -1,12 +1,25 @@
-from selenium.webdriver.chrome.webdriver import WebDriver
-from selenium.webdriver.common.by import By
-from time import sleep
-from typing import List
-import undetected_chromedriver as uc
-from undetected_chromedriver import ChromeOptions
-
-from match import Match
+import logging
+from lxml.html import HtmlElement
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from dom import parse_html
+from entity_registry import EntityRegistry
+from event import Event
+from fetcher import FetchError, Fetcher, check_page_source
+from match import Match, get_match_map_urls, is_skipped_match
+from match_map import MatchMap
+from match_map_player import MatchMapPlayer
+from metrics import Metrics
+from page_cache import PageCache
+from parsers import parse_results_page
+from player import Player
+from rate_limiter import RateLimiter
 from result import Result
+from results_cursor import ResultsCursor
+from team import Team
+from utils import get_event_url, get_page_type, get_player_url, get_results_url, get_team_url
+
+logger = logging.getLogger(__name__)
 
 
 class HltvClient:
@@ -14,39 +27,229 @@ class HltvClient:
     The HLTV API client that exposes data fetching functions.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        page_load_timeout: float = 15,
+        rate_limiter: Optional[RateLimiter] = None,
+        page_cache: Optional[PageCache] = None,
+        fetcher: Optional[Fetcher] = None,
+        max_retries: int = 4,
+        metrics: Optional[Metrics] = None,
+        registry: Optional[EntityRegistry] = None,
+    ):
         """
         Initialize a new HltvClient object.
+
+        Parameters
+        ----------
+        page_load_timeout : float
+            Maximum number of seconds to wait for a page's key element to load
+            when using the default ChromeFetcher.
+
+        rate_limiter : Optional[RateLimiter]
+            Limits how often pages are requested and backs off when HLTV fails
+            or blocks a request. Share one instance between clients to apply a
+            global limit. Defaults to a RateLimiter of its own.
+
+        page_cache : Optional[PageCache]
+            Cache to read pages from before fetching them. The browser is only
+            started once a page is not found in the cache.
+
+        fetcher : Optional[Fetcher]
+            The backend used to fetch pages (e.g. ChromeFetcher, HttpFetcher or
+            ReplayFetcher). Defaults to a ChromeFetcher.
+
+        max_retries : int
+            Number of times to retry a page after a failed or blocked request.
+
+        metrics : Optional[Metrics]
+            Collects fetch, wait and parse timings and crawl counters. Share one
+            instance between clients to collect them in one place.
+
+        registry : Optional[EntityRegistry]
+            Holds the teams, players and events fetched by `get_team`,
+            `get_player` and `get_event`, so each is fetched once per TTL.
+            Share one instance between clients to share the entities.
         """
-        self._driver = self._initialize_undetected_chromedriver()
+        self.metrics: Metrics = metrics or Metrics()
+        self.registry: EntityRegistry = registry or EntityRegistry()
+        if fetcher is None:
+            # Imported here so that clients with other fetchers (and the parsers)
+            # do not need to load selenium and undetected_chromedriver
+            from chrome_fetcher import ChromeFetcher
 
-    def _initialize_undetected_chromedriver(self) -> WebDriver:
-        options: ChromeOptions = uc.ChromeOptions()
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        # options.add_argument("--headless") # Currently does not work with undetected_chromedriver
-        driver: WebDriver = uc.Chrome(use_subprocess=True, options=options, version_main=111)
-        return driver
+            fetcher = ChromeFetcher(timeout=page_load_timeout, metrics=self.metrics)
+        self.fetcher: Fetcher = fetcher
+        self._rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.page_cache = page_cache
 
     def quit(self):
-        self._driver.quit()
+        self.fetcher.quit()
+
+    def get_page_source(self, url: str, use_cache: bool = True) -> str:
+        """
+        Get the source of an HLTV page, from the page cache if it is there.
+        The fetcher only gets pages; parsing happens on the page source.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page.
+
+        use_cache : bool
+            Whether a cached page source can be returned. If False, the page is
+            always fetched, and the fetched source still replaces the cached one.
+        """
+        if use_cache and self.page_cache is not None:
+            page_source = self.page_cache.get(url)
+            if page_source is not None:
+                self.metrics.increment("cache_hits", page_type=get_page_type(url))
+                return page_source
+        page_source = self._fetch_page_source(url)
+        if self.page_cache is not None:
+            self.page_cache.set(url, page_source)
+        return page_source
+
+    def _fetch_page_source(self, url: str) -> str:
+        # Every attempt waits on the rate limiter, which also applies the
+        # backoff after a failure. Challenge pages count as failures.
+        page_type = get_page_type(url)
+        attempt = 0
+        while True:
+            with self.metrics.timer("rate_limit_wait", page_type=page_type):
+                self._rate_limiter.acquire()
+            try:
+                with self.metrics.timer("fetch", page_type=page_type):
+                    page_source = self.fetcher.get_page_source(url)
+                check_page_source(url, page_source)
+            except FetchError as e:
+                self._rate_limiter.record_failure()
+                self.metrics.increment("fetch_errors", page_type=page_type, error=type(e).__name__)
+                if not e.retryable or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.metrics.increment("retries", page_type=page_type)
+                continue
+            self._rate_limiter.record_success()
+            self.metrics.increment("pages_fetched", page_type=page_type)
+            return page_source
+
+    def _get_page(self, url: str) -> HtmlElement:
+        page_source = self.get_page_source(url)
+        with self.metrics.timer("parse_html", page_type=get_page_type(url)):
+            return parse_html(page_source)
 
     def get_results(self, offset_start: int = 0, offset_end: int = 0) -> List[Result]:
-        results: List[Result] = []
+        return list(self.iter_results(offset_start=offset_start, offset_end=offset_end))
+
+    def iter_results(self, offset_start: int = 0, offset_end: int = 0) -> Iterator[Result]:
+        """
+        Iterate over results, fetching each results page only once the
+        previous page's results have been consumed.
+        """
         current_offset = offset_start
         while current_offset <= offset_end:
-            self._driver.get(f"https://www.hltv.org/results?offset={current_offset}")
-            sleep(5)  # Give time for page to load
-            for result_div in self._driver.find_elements(By.CLASS_NAME, "result-con"):
-                if result_div.get_attribute("data-zonedgrouping-entry-unix") == None:
-                    # If the result div does not have the unix attribute, it is one
-                    # of the featured results at the top of the page. Skip these.
-                    continue
-                result = Result(result_div)
-                results.append(result)
+            page_source = self.get_page_source(get_results_url(current_offset))
+            with self.metrics.timer("parse", entity="results"):
+                results = parse_results_page(page_source)
+            yield from results
+            current_offset += 100
+
+    def sync_results(
+        self, cursor: Optional[ResultsCursor] = None, max_offset: int = 10000
+    ) -> Tuple[List[Result], ResultsCursor]:
+        """
+        Get the results that are not known to `cursor`, paging only until the
+        results are older than the cursor's lookback window.
+
+        Parameters
+        ----------
+        cursor : Optional[ResultsCursor]
+            Watermark returned by the previous sync. Without a cursor, every page
+            up to `max_offset` is fetched.
+
+        max_offset : int
+            The last results offset to fetch if the lookback window is not passed.
+
+        Returns
+        -------
+        Tuple[List[Result], ResultsCursor]
+            The new results, newest first, and the cursor to pass to the next sync.
+        """
+        cursor = cursor or ResultsCursor()
+        # Results inside the lookback window, known or not, to carry into the next cursor
+        window_results: List[Result] = []
+        new_results: List[Result] = []
+        current_offset = 0
+        passed_window = False
+        while not passed_window and current_offset <= max_offset:
+            page_source = self.get_page_source(get_results_url(current_offset))
+            with self.metrics.timer("parse", entity="results"):
+                page_results = parse_results_page(page_source)
+            if len(page_results) == 0:
+                break
+            for result in page_results:
+                if cursor.is_past_window(result):
+                    passed_window = True
+                    break
+                window_results.append(result)
+                # Matches that started before known ones can finish after them
+                if not cursor.is_known(result):
+                    new_results.append(result)
             current_offset += 100
-        return results
+        return new_results, cursor.advance(window_results)
 
-    def get_match(self, match_url) -> Match:
-        match = Match(driver=self._driver, url=match_url)
+    def get_match(self, match_url, prefetch_maps: bool = False) -> Match:
+        """
+        Get a match. Its map stats pages are fetched when `match_maps` is first
+        accessed, or immediately if `prefetch_maps` is set.
+        """
+        logger.info("Getting match from %s", match_url)
+        page = self._get_page(match_url)
+        map_page_loader = self._get_page
+        if prefetch_maps and not is_skipped_match(page):
+            # Fetch the map stats pages first so the parse timer only covers parsing
+            map_pages = {map_url: self._get_page(map_url) for map_url in get_match_map_urls(page)}
+            map_page_loader = map_pages.__getitem__
+        with self.metrics.timer("parse", entity="match"):
+            match = Match(page=page, url=match_url, map_page_loader=map_page_loader, prefetch_maps=prefetch_maps)
+        if match.skipped:
+            self.metrics.increment("skipped_matches")
         return match
+
+    def iter_match_records(
+        self, match_urls: Iterable[str], sides: Tuple[str, ...] = ("Both",)
+    ) -> Iterator[Tuple[Match, MatchMap, MatchMapPlayer]]:
+        """
+        Iterate over (Match, MatchMap, MatchMapPlayer) records for each match,
+        fetching one match at a time. Skipped matches produce no records.
+        """
+        for match_url in match_urls:
+            yield from self.get_match(match_url, prefetch_maps=True).iter_player_records(sides=sides)
+
+    def _get_entity(self, kind: str, hltv_id: int, url: str, entity_class: type):
+        def load():
+            page = self._get_page(url)
+            with self.metrics.timer("parse", entity=kind):
+                return entity_class(page=page, url=url)
+
+        return self.registry.get_or_load(kind, hltv_id, load)
+
+    def get_team(self, hltv_team_id: int) -> Team:
+        """
+        Get a team's profile. Fetched at most once per the registry's TTL.
+        """
+        return self._get_entity("team", hltv_team_id, get_team_url(hltv_team_id), Team)
+
+    def get_player(self, hltv_player_id: int) -> Player:
+        """
+        Get a player's profile. Fetched at most once per the registry's TTL.
+        """
+        return self._get_entity("player", hltv_player_id, get_player_url(hltv_player_id), Player)
+
+    def get_event(self, hltv_event_id: int) -> Event:
+        """
+        Get an event. Fetched at most once per the registry's TTL.
+        """
+        return self._get_entity("event", hltv_event_id, get_event_url(hltv_event_id), Event)
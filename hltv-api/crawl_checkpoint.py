@@ -0,0 +1,143 @@
+import sqlite3
+import zlib
+from threading import Lock
+from time import time
+from typing import Iterable, List, Optional, Set, Tuple
+
+
+class CrawlCheckpoint:
+    """
+    Durable record of a crawl's progress, kept in a SQLite file. Tracks the
+    results offsets that have been read, the matches they list, the map stats
+    pages of matches that are still in progress, and the match map IDs of
+    finished matches. Each update is committed atomically, so a crawl that
+    dies partway through can be restarted without refetching finished work.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize a new CrawlCheckpoint object.
+
+        Parameters
+        ----------
+        path : str
+            Path of the SQLite checkpoint file. Created if it does not exist.
+        """
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results_offsets (results_offset INTEGER PRIMARY KEY, completed_at REAL)"
+            )
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS matches (
+                    hltv_match_id INTEGER PRIMARY KEY,
+                    match_url TEXT NOT NULL,
+                    results_offset INTEGER,
+                    completed_at REAL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS match_maps (hltv_match_map_id INTEGER PRIMARY KEY, hltv_match_id INTEGER)"
+            )
+            # Pages of matches that are not finished yet, so they are not
+            # fetched again if the crawl restarts before the match is finished
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS pending_pages (url TEXT PRIMARY KEY, hltv_match_id INTEGER, content BLOB)"
+            )
+
+    def close(self):
+        self._connection.close()
+
+    def is_offset_completed(self, results_offset: int) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM results_offsets WHERE results_offset = ?", (results_offset,)
+            ).fetchone()
+        return row is not None
+
+    def complete_offset(self, results_offset: int, matches: Iterable[Tuple[int, str]]):
+        """
+        Mark a results offset as read, queueing the (match ID, match URL) pairs
+        it lists in the same transaction. Matches that are already known keep
+        their state.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO matches (hltv_match_id, match_url, results_offset) VALUES (?, ?, ?)",
+                [(hltv_match_id, match_url, results_offset) for hltv_match_id, match_url in matches],
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results_offsets (results_offset, completed_at) VALUES (?, ?)",
+                (results_offset, time()),
+            )
+
+    def add_match(self, hltv_match_id: int, match_url: str):
+        """
+        Queue a match that is not listed on a results page.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO matches (hltv_match_id, match_url) VALUES (?, ?)", (hltv_match_id, match_url)
+            )
+
+    def get_pending_match_urls(self, results_offsets: Optional[Iterable[int]] = None) -> List[str]:
+        """
+        Get the URLs of queued matches that are not finished, in the order
+        they were listed. Pass `results_offsets` to only get the matches listed
+        on those results pages.
+        """
+        sql = "SELECT match_url, results_offset FROM matches WHERE completed_at IS NULL ORDER BY results_offset, rowid"
+        with self._lock:
+            rows = self._connection.execute(sql).fetchall()
+        if results_offsets is None:
+            return [match_url for match_url, _ in rows]
+        offsets = set(results_offsets)
+        return [match_url for match_url, results_offset in rows if results_offset in offsets]
+
+    def is_match_completed(self, hltv_match_id: int) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM matches WHERE hltv_match_id = ? AND completed_at IS NOT NULL", (hltv_match_id,)
+            ).fetchone()
+        return row is not None
+
+    def get_completed_match_map_ids(self) -> Set[int]:
+        with self._lock:
+            rows = self._connection.execute("SELECT hltv_match_map_id FROM match_maps").fetchall()
+        return {row[0] for row in rows}
+
+    def get_pending_page(self, url: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute("SELECT content FROM pending_pages WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def save_pending_page(self, url: str, hltv_match_id: int, page_source: str):
+        content = zlib.compress(page_source.encode("utf-8"))
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pending_pages (url, hltv_match_id, content) VALUES (?, ?, ?)",
+                (url, hltv_match_id, content),
+            )
+
+    def complete_match(self, hltv_match_id: int, match_url: str, hltv_match_map_ids: Iterable[int]):
+        """
+        Mark a match and its maps as finished and drop its pending pages, in
+        one transaction.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO matches (hltv_match_id, match_url) VALUES (?, ?)", (hltv_match_id, match_url)
+            )
+            self._connection.execute(
+                "UPDATE matches SET completed_at = ? WHERE hltv_match_id = ?", (time(), hltv_match_id)
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO match_maps (hltv_match_map_id, hltv_match_id) VALUES (?, ?)",
+                [(hltv_match_map_id, hltv_match_id) for hltv_match_map_id in hltv_match_map_ids],
+            )
+            self._connection.execute("DELETE FROM pending_pages WHERE hltv_match_id = ?", (hltv_match_id,))
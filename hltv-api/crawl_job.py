@@ -0,0 +1,110 @@
+from typing import Callable, Iterable, List, Optional
+
+from client import HltvClient
+from crawl_checkpoint import CrawlCheckpoint
+from dom import parse_html
+from match import Match
+from parsers import parse_results_page
+from result import Result
+from utils import get_id_from_match_url, get_results_url
+
+
+class CrawlJob:
+    """
+    A resumable crawl of results pages and the matches they list. Progress is
+    recorded in a CrawlCheckpoint, so running the job again after a crash
+    skips the results offsets, matches and map stats pages that were already
+    fetched.
+
+    Finished matches are passed to `match_sink` (e.g. a SqliteStore) before
+    they are marked as finished. A crash between the two re-emits that one
+    match on restart, so the sink should upsert.
+    """
+
+    def __init__(
+        self,
+        client: HltvClient,
+        checkpoint: CrawlCheckpoint,
+        match_sink: Callable[[Match], None],
+        results_sink: Optional[Callable[[List[Result]], None]] = None,
+    ):
+        """
+        Initialize a new CrawlJob object.
+
+        Parameters
+        ----------
+        client : HltvClient
+            Client used to fetch pages.
+
+        checkpoint : CrawlCheckpoint
+            Where the crawl's progress is recorded.
+
+        match_sink : Callable[[Match], None]
+            Called with each fully loaded match, e.g.
+            `lambda match: store.save_matches([match])`.
+
+        results_sink : Optional[Callable[[List[Result]], None]]
+            Called with the results of each results page that is read.
+        """
+        self.client = client
+        self.checkpoint = checkpoint
+        self.match_sink = match_sink
+        self.results_sink = results_sink
+
+    def run(self, offset_start: int = 0, offset_end: int = 0) -> int:
+        """
+        Crawl every match listed on the results pages between the two offsets.
+        Each results page's matches are crawled before the next page is read.
+        Returns the number of matches crawled by this run.
+        """
+        match_count = 0
+        for offset in range(offset_start, offset_end + 1, 100):
+            if not self.checkpoint.is_offset_completed(offset):
+                results = parse_results_page(self.client.get_page_source(get_results_url(offset)))
+                if self.results_sink is not None:
+                    self.results_sink(results)
+                self.checkpoint.complete_offset(
+                    offset, [(result.hltv_match_id, result.match_url) for result in results]
+                )
+            for match_url in self.checkpoint.get_pending_match_urls(results_offsets=[offset]):
+                self._crawl_match(match_url)
+                match_count += 1
+        return match_count
+
+    def run_matches(self, match_urls: Iterable[str]) -> int:
+        """
+        Crawl the given matches, skipping those already finished. Returns the
+        number of matches crawled by this run.
+        """
+        match_count = 0
+        for match_url in match_urls:
+            hltv_match_id = get_id_from_match_url(match_url)
+            if self.checkpoint.is_match_completed(hltv_match_id):
+                continue
+            self.checkpoint.add_match(hltv_match_id, match_url)
+            self._crawl_match(match_url)
+            match_count += 1
+        return match_count
+
+    def _get_page_source(self, url: str, hltv_match_id: int) -> str:
+        # Pages of an unfinished match are kept in the checkpoint until the
+        # match is finished, so a restart picks up where the match left off.
+        page_source = self.checkpoint.get_pending_page(url)
+        if page_source is None:
+            page_source = self.client.get_page_source(url)
+            self.checkpoint.save_pending_page(url, hltv_match_id, page_source)
+        return page_source
+
+    def _crawl_match(self, match_url: str) -> Match:
+        hltv_match_id = get_id_from_match_url(match_url)
+        match = Match(
+            page=parse_html(self._get_page_source(match_url, hltv_match_id)),
+            url=match_url,
+            map_page_loader=lambda map_url: parse_html(self._get_page_source(map_url, hltv_match_id)),
+            prefetch_maps=True,
+        )
+        self.match_sink(match)
+        self.checkpoint.complete_match(
+            hltv_match_id, match_url, [match_map.hltv_match_map_id for match_map in match.match_maps]
+        )
+        return match
@@ -0,0 +1,275 @@
+import sqlite3
+import zlib
+from threading import Lock
+from time import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from match import Match
+from parsers import parse_match_pages
+from utils import get_results_url
+
+# Leased first: map stats pages, then match pages, then results pages, so
+# matches started by a worker are finished before new ones are listed
+KIND_PRIORITIES: Dict[str, int] = {"match_map": 0, "match": 1, "results": 2}
+
+
+class WorkItem:
+    """
+    A page to be fetched by a crawl worker: a results page, a match page or a
+    map stats page.
+    """
+
+    def __init__(self, item_id: int, kind: str, url: str, parent_url: Optional[str], attempts: int):
+        self.item_id: int = item_id
+        self.kind: str = kind
+        self.url: str = url
+        # The match URL of a map stats page
+        self.parent_url: Optional[str] = parent_url
+        self.attempts: int = attempts
+
+
+class CrawlQueue:
+    """
+    A work queue for crawling with several workers, possibly on different
+    hosts, stored in a SQLite file. Workers lease items for a limited time;
+    items whose lease expires (e.g. because the worker died) are handed out
+    again. Fetched pages flow back into the queue file, where finished
+    matches are assembled with `iter_finished_matches`.
+
+    SQLite on a shared file system stands in for a real message broker, and
+    is only safe on file systems with working file locks.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 300, max_attempts: int = 5, timeout: float = 60):
+        """
+        Initialize a new CrawlQueue object.
+
+        Parameters
+        ----------
+        path : str
+            Path of the SQLite queue file. Created if it does not exist.
+
+        lease_seconds : float
+            Number of seconds a worker has to finish a leased item before it is
+            handed to another worker.
+
+        max_attempts : int
+            Number of times an item is leased before it is marked as failed.
+
+        timeout : float
+            Number of seconds to wait for another process to release the queue file.
+        """
+        self.lease_seconds: float = lease_seconds
+        self.max_attempts: int = max_attempts
+        self._lock = Lock()
+        # Transactions are started explicitly, so leases can take a write lock up front
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        with self._transaction():
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS work_items (
+                    item_id INTEGER PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    url TEXT NOT NULL UNIQUE,
+                    parent_url TEXT,
+                    priority INTEGER NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    leased_by TEXT,
+                    lease_expires_at REAL,
+                    error TEXT,
+                    collected INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS work_items_state ON work_items (state, priority, item_id)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS work_items_parent_url ON work_items (parent_url)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, content BLOB NOT NULL)")
+
+    def close(self):
+        self._connection.close()
+
+    def _transaction(self):
+        return _Transaction(self._connection, self._lock)
+
+    def _insert_items(self, items: Iterable[Tuple[str, str, Optional[str]]]):
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO work_items (kind, url, parent_url, priority) VALUES (?, ?, ?, ?)",
+            [(kind, url, parent_url, KIND_PRIORITIES[kind]) for kind, url, parent_url in items],
+        )
+
+    def add_results_offsets(self, offset_start: int = 0, offset_end: int = 0):
+        """
+        Queue the results pages between the two offsets. Their matches, and
+        the matches' map stats pages, are queued as the pages are fetched.
+        """
+        with self._transaction():
+            self._insert_items(
+                ("results", get_results_url(offset), None) for offset in range(offset_start, offset_end + 1, 100)
+            )
+
+    def add_match_urls(self, match_urls: Iterable[str]):
+        with self._transaction():
+            self._insert_items(("match", match_url, None) for match_url in match_urls)
+
+    def lease(self, worker_id: str, limit: int = 1) -> List[WorkItem]:
+        """
+        Lease up to `limit` items that are pending or whose lease has expired.
+        """
+        now = time()
+        with self._transaction():
+            # Items that keep failing to finish are given up on
+            self._connection.execute(
+                "UPDATE work_items SET state = 'failed', error = 'Lease expired too many times' "
+                "WHERE state = 'leased' AND lease_expires_at < ? AND attempts >= ?",
+                (now, self.max_attempts),
+            )
+            rows = self._connection.execute(
+                "SELECT item_id, kind, url, parent_url, attempts FROM work_items "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_expires_at < ?) "
+                "ORDER BY priority, item_id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            self._connection.executemany(
+                "UPDATE work_items SET state = 'leased', leased_by = ?, lease_expires_at = ?, "
+                "attempts = attempts + 1 WHERE item_id = ?",
+                [(worker_id, now + self.lease_seconds, row[0]) for row in rows],
+            )
+        return [
+            WorkItem(item_id=item_id, kind=kind, url=url, parent_url=parent_url, attempts=attempts + 1)
+            for item_id, kind, url, parent_url, attempts in rows
+        ]
+
+    def extend_lease(self, item: WorkItem, worker_id: str) -> bool:
+        """
+        Extend a lease that is still held by `worker_id`. Returns False if the
+        lease was lost to another worker.
+        """
+        with self._transaction():
+            cursor = self._connection.execute(
+                "UPDATE work_items SET lease_expires_at = ? "
+                "WHERE item_id = ? AND state = 'leased' AND leased_by = ?",
+                (time() + self.lease_seconds, item.item_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, item: WorkItem, worker_id: str, page_source: str, child_urls: Iterable[str] = ()) -> bool:
+        """
+        Store a fetched page, queue the pages it links to (matches of a results
+        page, map stats pages of a match page) and mark the item as done, in
+        one transaction. Returns False, without changing anything, if the lease
+        is no longer held by `worker_id` (e.g. it expired and the item was
+        leased to another worker).
+        """
+        child_kind = "match" if item.kind == "results" else "match_map"
+        parent_url = item.url if child_kind == "match_map" else None
+        content = zlib.compress(page_source.encode("utf-8"))
+        with self._transaction():
+            cursor = self._connection.execute(
+                "UPDATE work_items SET state = 'done', leased_by = NULL, lease_expires_at = NULL, error = NULL "
+                "WHERE item_id = ? AND state = 'leased' AND leased_by = ?",
+                (item.item_id, worker_id),
+            )
+            if cursor.rowcount != 1:
+                return False
+            self._insert_items((child_kind, child_url, parent_url) for child_url in child_urls)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pages (url, content) VALUES (?, ?)", (item.url, content)
+            )
+        return True
+
+    def fail(self, item: WorkItem, worker_id: str, error: str, retryable: bool = True) -> bool:
+        """
+        Return an item to the queue after a failed fetch, or mark it as failed
+        once it is out of attempts or cannot succeed. Returns False if the
+        lease is no longer held by `worker_id`.
+        """
+        state = "pending" if retryable and item.attempts < self.max_attempts else "failed"
+        with self._transaction():
+            cursor = self._connection.execute(
+                "UPDATE work_items SET state = ?, leased_by = NULL, lease_expires_at = NULL, error = ? "
+                "WHERE item_id = ? AND state = 'leased' AND leased_by = ?",
+                (state, error, item.item_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def get_counts(self) -> Dict[Tuple[str, str], int]:
+        """
+        Get the number of items by (kind, state).
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT kind, state, COUNT(*) FROM work_items GROUP BY kind, state"
+            ).fetchall()
+        return {(kind, state): count for kind, state, count in rows}
+
+    def is_finished(self) -> bool:
+        """
+        Whether every item is done or failed.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM work_items WHERE state IN ('pending', 'leased') LIMIT 1"
+            ).fetchone()
+        return row is None
+
+    def _get_page_source(self, url: str) -> str:
+        row = self._connection.execute("SELECT content FROM pages WHERE url = ?", (url,)).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def iter_finished_matches(self) -> Iterator[Match]:
+        """
+        Parse and yield each match whose match page and map stats pages have
+        all been fetched and that has not been yielded before. A match is
+        marked as collected once the caller has consumed it.
+        """
+        with self._lock:
+            match_urls = [
+                row[0]
+                for row in self._connection.execute(
+                    "SELECT url FROM work_items AS m WHERE kind = 'match' AND state = 'done' AND collected = 0 "
+                    "AND NOT EXISTS (SELECT 1 FROM work_items AS c WHERE c.parent_url = m.url AND c.state != 'done') "
+                    "ORDER BY item_id"
+                ).fetchall()
+            ]
+        for match_url in match_urls:
+            with self._lock:
+                match_source = self._get_page_source(match_url)
+                map_urls = [
+                    row[0]
+                    for row in self._connection.execute(
+                        "SELECT url FROM work_items WHERE parent_url = ?", (match_url,)
+                    ).fetchall()
+                ]
+                map_sources = {map_url: self._get_page_source(map_url) for map_url in map_urls}
+            yield parse_match_pages(match_source, match_url, map_sources)
+            with self._transaction():
+                self._connection.execute("UPDATE work_items SET collected = 1 WHERE url = ?", (match_url,))
+
+
+class _Transaction:
+    """
+    Runs a block in a transaction that takes SQLite's write lock up front, so
+    two workers cannot lease the same item.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, lock: Lock):
+        self._connection = connection
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire()
+        try:
+            self._connection.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self._connection.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+        finally:
+            self._lock.release()
@@ -0,0 +1,114 @@
+import logging
+import os
+import socket
+from contextlib import contextmanager
+from threading import Event, Thread
+from time import sleep
+from typing import Iterator, List, Optional
+
+from client import HltvClient
+from crawl_queue import CrawlQueue, WorkItem
+from dom import ElementNotFoundError
+from fetcher import FetchError
+from parsers import parse_match_map_urls, parse_results_page
+
+logger = logging.getLogger(__name__)
+
+# Errors raised when parsing a page that does not have the expected layout
+PARSE_ERRORS = (ElementNotFoundError, AttributeError, IndexError, ValueError)
+
+
+class CrawlWorker:
+    """
+    Fetches pages leased from a CrawlQueue until the queue is finished. Run
+    one worker per host (or per browser) to spread a crawl across machines.
+    """
+
+    def __init__(self, client: HltvClient, queue: CrawlQueue, worker_id: Optional[str] = None):
+        """
+        Initialize a new CrawlWorker object.
+
+        Parameters
+        ----------
+        client : HltvClient
+            Client used to fetch pages, with its own rate limit and fetcher.
+
+        queue : CrawlQueue
+            The shared queue to lease work from.
+
+        worker_id : Optional[str]
+            Name of the worker in leases. Defaults to the host name and process ID.
+        """
+        self.client = client
+        self.queue = queue
+        self.worker_id: str = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+
+    def _get_child_urls(self, item: WorkItem, page_source: str) -> List[str]:
+        if item.kind == "results":
+            return [result.match_url for result in parse_results_page(page_source)]
+        if item.kind == "match":
+            return parse_match_map_urls(page_source)
+        return []
+
+    @contextmanager
+    def _keep_lease(self, item: WorkItem) -> Iterator[None]:
+        # A fetch can outlast a lease (the client backs off for minutes between
+        # retries), so the lease is extended in the background until it is done.
+        done = Event()
+
+        def extend_lease():
+            while not done.wait(self.queue.lease_seconds / 3):
+                if not self.queue.extend_lease(item, self.worker_id):
+                    return
+
+        thread = Thread(target=extend_lease, name=f"lease-{item.item_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def _check_lease(self, item: WorkItem, held: bool):
+        if not held:
+            self.client.metrics.increment("lost_leases", kind=item.kind)
+            logger.warning("Lost the lease on %s to another worker; its result was discarded", item.url)
+
+    def process(self, item: WorkItem):
+        """
+        Fetch a leased item's page and report it back to the queue. Pages that
+        cannot be parsed are marked as failed, as fetching them again would not help.
+        Results of items whose lease was lost to another worker are discarded
+        and counted in the client's "lost_leases" metric.
+        """
+        try:
+            with self._keep_lease(item):
+                page_source = self.client.get_page_source(item.url)
+        except FetchError as e:
+            self._check_lease(item, self.queue.fail(item, self.worker_id, error=str(e), retryable=e.retryable))
+            return
+        try:
+            child_urls = self._get_child_urls(item, page_source)
+        except PARSE_ERRORS as e:
+            error = f"Could not parse page: {e!r}"
+            self._check_lease(item, self.queue.fail(item, self.worker_id, error=error, retryable=False))
+            return
+        self._check_lease(item, self.queue.complete(item, self.worker_id, page_source, child_urls=child_urls))
+
+    def run(self, max_items: Optional[int] = None, poll_seconds: float = 5) -> int:
+        """
+        Process items until the queue is finished (or `max_items` have been
+        processed). Waits `poll_seconds` whenever every remaining item is
+        leased by other workers. Returns the number of items processed.
+        """
+        processed = 0
+        while max_items is None or processed < max_items:
+            items = self.queue.lease(self.worker_id)
+            if len(items) == 0:
+                if self.queue.is_finished():
+                    break
+                sleep(poll_seconds)
+                continue
+            self.process(items[0])
+            processed += 1
+        return processed
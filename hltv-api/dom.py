@@ -0,0 +1,53 @@
+from functools import lru_cache
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.html import HtmlElement
+from typing import List, Optional, Union
+
+HLTV_BASE_URL = "https://www.hltv.org"
+
+
+class ElementNotFoundError(Exception):
+    """
+    Raised when an expected element is missing from a parsed HLTV page.
+    """
+
+
+def parse_html(source: Union[str, bytes], base_url: str = HLTV_BASE_URL) -> HtmlElement:
+    """
+    Parse page source (e.g. `driver.page_source` or saved HTML bytes) into an
+    in-process DOM. Links are made absolute so that the ID helpers in `utils`
+    see the same URLs that Selenium's `get_attribute("href")` returns.
+    """
+    page = lxml_html.fromstring(source, base_url=base_url)
+    page.make_links_absolute(base_url)
+    return page
+
+
+@lru_cache(maxsize=None)
+def _compile_xpath(class_name: Optional[str], tag_name: Optional[str]) -> etree.XPath:
+    path = f"descendant::{tag_name or '*'}"
+    if class_name is not None:
+        # Same matching semantics as Selenium's By.CLASS_NAME
+        path += f"[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+    return etree.XPath(path)
+
+
+def find_elements(
+    element: HtmlElement, class_name: Optional[str] = None, tag_name: Optional[str] = None
+) -> List[HtmlElement]:
+    return _compile_xpath(class_name, tag_name)(element)
+
+
+def find_element(
+    element: HtmlElement, class_name: Optional[str] = None, tag_name: Optional[str] = None
+) -> HtmlElement:
+    elements = find_elements(element, class_name=class_name, tag_name=tag_name)
+    if len(elements) == 0:
+        raise ElementNotFoundError(f"No element found (class={class_name}, tag={tag_name})")
+    return elements[0]
+
+
+def get_text(element: HtmlElement) -> str:
+    # Collapse whitespace the way a rendered WebElement.text would
+    return " ".join(element.text_content().split())
@@ -0,0 +1,177 @@
+from selenium.webdriver.chrome.webdriver import WebDriver
+from threading import Lock, Thread
+from typing import Any, Optional
+import undetected_chromedriver as uc
+from undetected_chromedriver import ChromeOptions
+
+from metrics import Metrics
+
+
+class DriverManager:
+    """
+    Starts, reuses and recycles the Chrome driver of a ChromeFetcher.
+
+    A driver is replaced once it has loaded `max_pages` pages or its browser
+    processes use more than `max_rss_bytes` of memory. Drivers are only
+    replaced between page loads, so no page in progress is lost. With
+    `keep_spare`, the next driver is started in the background so a
+    replacement does not wait for Chrome to start.
+    """
+
+    # undetected_chromedriver patches its driver binary on startup, which is
+    # not safe to do from several threads at once.
+    _driver_start_lock = Lock()
+
+    def __init__(
+        self,
+        headless: bool = False,
+        virtual_display: bool = False,
+        max_pages: Optional[int] = None,
+        max_rss_bytes: Optional[int] = None,
+        keep_spare: bool = False,
+        metrics: Optional[Metrics] = None,
+    ):
+        """
+        Initialize a new DriverManager object.
+
+        Parameters
+        ----------
+        headless : bool
+            Run Chrome with its new headless mode.
+
+        virtual_display : bool
+            Run a visible Chrome on a virtual X display (requires Xvfb and
+            pyvirtualdisplay). An alternative to `headless` where headless
+            Chrome gets challenged.
+
+        max_pages : Optional[int]
+            Number of pages after which a driver is replaced.
+
+        max_rss_bytes : Optional[int]
+            Resident memory of the browser processes above which a driver is
+            replaced (requires psutil).
+
+        keep_spare : bool
+            Keep a started driver ready to replace the current one.
+
+        metrics : Optional[Metrics]
+            Collects driver start timings and recycle counts.
+        """
+        self.headless: bool = headless
+        self.virtual_display: bool = virtual_display
+        self.max_pages: Optional[int] = max_pages
+        self.max_rss_bytes: Optional[int] = max_rss_bytes
+        self.keep_spare: bool = keep_spare
+        self.metrics: Metrics = metrics or Metrics()
+        self.page_count: int = 0
+        self._driver: Optional[WebDriver] = None
+        self._spare: Optional[WebDriver] = None
+        self._spare_thread: Optional[Thread] = None
+        self._display: Optional[Any] = None
+
+    def _start_driver(self) -> WebDriver:
+        if self.virtual_display and self._display is None:
+            from pyvirtualdisplay import Display
+
+            self._display = Display(visible=False, size=(1920, 1080))
+            self._display.start()
+        options: ChromeOptions = uc.ChromeOptions()
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        with DriverManager._driver_start_lock, self.metrics.timer("driver_start"):
+            # undetected_chromedriver sets up the new headless mode itself,
+            # including a user agent without "HeadlessChrome"
+            driver: WebDriver = uc.Chrome(
+                use_subprocess=True, options=options, version_main=111, headless=self.headless
+            )
+        return driver
+
+    def _start_spare(self):
+        def start():
+            self._spare = self._start_driver()
+
+        self._spare_thread = Thread(target=start, daemon=True)
+        self._spare_thread.start()
+
+    def _take_spare(self) -> Optional[WebDriver]:
+        if self._spare_thread is not None:
+            self._spare_thread.join()
+            self._spare_thread = None
+        spare, self._spare = self._spare, None
+        return spare
+
+    @property
+    def driver(self) -> WebDriver:
+        """
+        The current driver, started (or taken from the spare) if needed.
+        """
+        if self._driver is None:
+            self._driver = self._take_spare() or self._start_driver()
+            self.page_count = 0
+            if self.keep_spare:
+                self._start_spare()
+        return self._driver
+
+    def get_rss_bytes(self) -> int:
+        """
+        Get the resident memory of the current browser and its child processes.
+        """
+        import psutil
+
+        if self._driver is None:
+            return 0
+        pid = getattr(self._driver, "browser_pid", None) or self._driver.service.process.pid
+        try:
+            process = psutil.Process(pid)
+            processes = [process, *process.children(recursive=True)]
+        except psutil.NoSuchProcess:
+            return 0
+        rss_bytes = 0
+        for process in processes:
+            try:
+                rss_bytes += process.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        return rss_bytes
+
+    def page_done(self):
+        """
+        Count a finished page load and replace the driver if it has reached
+        its page or memory limit. Call between page loads only.
+        """
+        self.page_count += 1
+        if self.max_pages is not None and self.page_count >= self.max_pages:
+            self.recycle(reason="pages")
+        elif self.max_rss_bytes is not None and self.get_rss_bytes() > self.max_rss_bytes:
+            self.recycle(reason="memory")
+
+    def recycle(self, reason: str = "requested"):
+        """
+        Quit the current driver; the next page uses the spare or a new driver.
+        Also used to discard a driver that crashed.
+        """
+        if self._driver is None:
+            return
+        old_driver, self._driver = self._driver, None
+        self.metrics.increment("driver_recycles", reason=reason)
+        # Quitting can take a while, and nothing is waiting on the old driver
+        Thread(target=_quit_driver, args=(old_driver,), daemon=True).start()
+
+    def quit(self):
+        if self._driver is not None:
+            _quit_driver(self._driver)
+            self._driver = None
+        spare = self._take_spare()
+        if spare is not None:
+            _quit_driver(spare)
+        if self._display is not None:
+            self._display.stop()
+            self._display = None
+
+
+def _quit_driver(driver: WebDriver):
+    try:
+        driver.quit()
+    except Exception:
+        # The browser may already be gone (e.g. after a crash)
+        pass
@@ -0,0 +1,80 @@
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Seconds a team, player or event stays fresh, by kind
+DEFAULT_TTLS: Dict[str, float] = {
+    "team": 24 * 60 * 60,  # Rankings and rosters change, but not by the hour
+    "player": 7 * 24 * 60 * 60,
+    "event": 7 * 24 * 60 * 60,
+}
+
+
+class EntityRegistry:
+    """
+    In-memory registry of teams, players and events keyed by their HLTV IDs.
+    Each entity is loaded at most once per TTL, however many matches refer to
+    it, including when several threads ask for it at once. Share one instance
+    between clients to share the entities.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None):
+        """
+        Initialize a new EntityRegistry object.
+
+        Parameters
+        ----------
+        ttls : Optional[Dict[str, float]]
+            Seconds an entity stays fresh, by kind ("team", "player", "event").
+            Overrides the matching DEFAULT_TTLS entries.
+        """
+        self.ttls: Dict[str, float] = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entities: Dict[Tuple[str, int], Tuple[float, Any]] = {}
+        self._lock = Lock()
+        self._load_locks: Dict[Tuple[str, int], Lock] = {}
+
+    def get(self, kind: str, hltv_id: int) -> Optional[Any]:
+        """
+        Get a registered entity, or None if it is not registered or has expired.
+        """
+        entry = self._entities.get((kind, hltv_id))
+        if entry is None or monotonic() - entry[0] > self.ttls[kind]:
+            return None
+        return entry[1]
+
+    def set(self, kind: str, hltv_id: int, entity: Any):
+        with self._lock:
+            self._entities[(kind, hltv_id)] = (monotonic(), entity)
+
+    def get_or_load(self, kind: str, hltv_id: int, load: Callable[[], Any]) -> Any:
+        """
+        Get a registered entity, calling `load` to fetch it if it is not
+        registered or has expired.
+        """
+        entity = self.get(kind, hltv_id)
+        if entity is not None:
+            self.hits += 1
+            return entity
+        with self._lock:
+            load_lock = self._load_locks.setdefault((kind, hltv_id), Lock())
+        with load_lock:
+            # Another thread may have loaded it while this one was waiting
+            entity = self.get(kind, hltv_id)
+            if entity is not None:
+                self.hits += 1
+                return entity
+            self.misses += 1
+            entity = load()
+            self.set(kind, hltv_id, entity)
+        with self._lock:
+            self._load_locks.pop((kind, hltv_id), None)
+        return entity
+
+    def evict_expired(self):
+        now = monotonic()
+        with self._lock:
+            expired = [key for key, (loaded_at, _) in self._entities.items() if now - loaded_at > self.ttls[key[0]]]
+            for key in expired:
+                del self._entities[key]
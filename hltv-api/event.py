@@ -0,0 +1,71 @@
+from datetime import datetime
+from lxml.html import HtmlElement
+from typing import List, Optional
+
+from dom import find_element, find_elements, get_text
+from utils import get_id_from_event_url, intern_name
+
+
+class Event:
+    """
+    Information about an event, such as its name, dates, prize pool and
+    location.
+    """
+
+    __slots__ = (
+        "hltv_event_id",
+        "url",
+        "name",
+        "start_date",
+        "end_date",
+        "prize_pool",
+        "location",
+    )
+
+    def __init__(self, page: HtmlElement, url: str):
+        """
+        Initialize a new Event object.
+
+        Parameters
+        ----------
+        page : HtmlElement
+            The parsed HTML of HLTV's event page.
+
+        url : str
+            The URL of HLTV's event page.
+        """
+        self.hltv_event_id: int = get_id_from_event_url(url)
+        self.url: str = url
+        self.name: Optional[str] = intern_name(get_text(find_element(page, class_name="event-hub-title")))
+        self.start_date: Optional[datetime] = None
+        self.end_date: Optional[datetime] = None
+        self._set_dates(page)
+        self.prize_pool: Optional[str] = self._get_info_text(page, "prizepool")
+        self.location: Optional[str] = intern_name(self._get_info_text(page, "location"))
+
+    def __str__(self) -> str:
+        s: str = "Event:\n"
+        for key in self.__slots__:
+            s += f"{key}: {str(getattr(self, key))}\n"
+        s += "\n"
+        return s
+
+    def _set_dates(self, page: HtmlElement):
+        # The start and end dates are spans with a "data-unix" timestamp in ms
+        date_cells = find_elements(page, class_name="eventdate")
+        if len(date_cells) == 0:
+            return
+        timestamps: List[float] = [
+            float(span.get("data-unix")) / 1000
+            for span in find_elements(date_cells[0], tag_name="span")
+            if span.get("data-unix") is not None
+        ]
+        if len(timestamps) > 0:
+            self.start_date = datetime.fromtimestamp(timestamps[0])
+            self.end_date = datetime.fromtimestamp(timestamps[-1])
+
+    def _get_info_text(self, page: HtmlElement, class_name: str) -> Optional[str]:
+        cells = find_elements(page, class_name=class_name)
+        if len(cells) == 0:
+            return None
+        return get_text(cells[0]) or None
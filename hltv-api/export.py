@@ -0,0 +1,209 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from itertools import islice
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+from uuid import uuid4
+
+from match import Match
+from match_map import MatchMap
+from match_map_player import MatchMapPlayer
+from match_map_player_batch import MatchMapPlayerBatch
+from pick_ban import PickBan
+from result import Result
+from round_outcome import RoundOutcome
+
+# Column names and pandas dtypes for each entity. Nullable "Int64" is used
+# where the parser can leave a value as None.
+RESULT_COLUMNS: Dict[str, str] = {
+    "hltv_match_id": "int64",
+    "match_url": "string",
+    "match_date": "datetime64[ns]",
+    "team1_name": "string",
+    "team1_score": "int64",
+    "team2_name": "string",
+    "team2_score": "int64",
+}
+
+MATCH_COLUMNS: Dict[str, str] = {
+    "hltv_match_id": "int64",
+    "url": "string",
+    "match_date": "datetime64[ns]",
+    "hltv_event_id": "int64",
+    "best_of": "Int64",
+    "team1_name": "string",
+    "team1_hltv_team_id": "Int64",
+    "team1_maps_won": "Int64",
+    "team1_world_rank": "Int64",
+    "team2_name": "string",
+    "team2_hltv_team_id": "Int64",
+    "team2_maps_won": "Int64",
+    "team2_world_rank": "Int64",
+}
+
+PICK_BAN_COLUMNS: Dict[str, str] = {
+    "hltv_match_id": "int64",
+    "pick_number": "int64",
+    "hltv_team_id": "int64",
+    "pick_type": "category",
+    "map_name": "category",
+}
+
+MATCH_MAP_COLUMNS: Dict[str, str] = {
+    "hltv_match_map_id": "int64",
+    "hltv_match_id": "Int64",
+    "map_number": "Int64",
+    "map_name": "category",
+    "team1_hltv_team_id": "Int64",
+    "team1_rounds_won": "Int64",
+    "team2_hltv_team_id": "Int64",
+    "team2_rounds_won": "Int64",
+    "team1_1h_side": "category",
+    "team1_1h_rounds_won": "Int64",
+    "team1_2h_side": "category",
+    "team1_2h_rounds_won": "Int64",
+    "team2_1h_side": "category",
+    "team2_1h_rounds_won": "Int64",
+    "team2_2h_side": "category",
+    "team2_2h_rounds_won": "Int64",
+    "team1_bombs_exploded": "Int64",
+    "team1_bombs_defused": "Int64",
+    "team2_bombs_exploded": "Int64",
+    "team2_bombs_defused": "Int64",
+}
+
+MATCH_MAP_PLAYER_COLUMNS: Dict[str, str] = {
+    "hltv_player_id": "int64",
+    "hltv_match_map_id": "int64",
+    "hltv_team_id": "int64",
+    "side": "category",
+    "kills": "int64",
+    "assists": "int64",
+    "flash_assists": "Int64",
+    "deaths": "int64",
+    "headshots": "int64",
+    "first_kills": "int64",
+    "first_deaths": "int64",
+    "kast_percent": "float64",
+    "adr": "float64",
+    "hltv_rating": "float64",
+}
+
+ROUND_OUTCOME_COLUMNS: Dict[str, str] = {
+    "hltv_match_map_id": "int64",
+    "round_number": "int64",
+    "winner_team_num": "int64",
+    "winner_hltv_team_id": "Int64",
+    "side": "category",
+    "win_type": "category",
+}
+
+
+def _to_dataframe(records: Iterable[Any], columns: Dict[str, str]) -> pd.DataFrame:
+    # Pull every attribute of a record in one call, then transpose the rows
+    # into columns so each column is converted to its dtype in one step.
+    getter = attrgetter(*columns)
+    rows = [getter(record) for record in records]
+    column_values = zip(*rows) if len(rows) > 0 else [[] for _ in columns]
+    return pd.DataFrame(
+        {
+            name: pd.Series(values, dtype=dtype)
+            for (name, dtype), values in zip(columns.items(), column_values)
+        }
+    )
+
+
+def results_to_dataframe(results: Iterable[Result]) -> pd.DataFrame:
+    return _to_dataframe(results, RESULT_COLUMNS)
+
+
+def matches_to_dataframe(matches: Iterable[Match]) -> pd.DataFrame:
+    # Skipped matches (forfeits, showmatches, etc.) have no match values
+    return _to_dataframe((match for match in matches if not match.skipped), MATCH_COLUMNS)
+
+
+def pick_bans_to_dataframe(pick_bans: Iterable[PickBan]) -> pd.DataFrame:
+    return _to_dataframe(pick_bans, PICK_BAN_COLUMNS)
+
+
+def match_maps_to_dataframe(match_maps: Iterable[MatchMap]) -> pd.DataFrame:
+    return _to_dataframe(match_maps, MATCH_MAP_COLUMNS)
+
+
+def match_map_players_to_dataframe(players: Iterable[MatchMapPlayer]) -> pd.DataFrame:
+    return _to_dataframe(players, MATCH_MAP_PLAYER_COLUMNS)
+
+
+def round_outcomes_to_dataframe(round_outcomes: Iterable[RoundOutcome]) -> pd.DataFrame:
+    return _to_dataframe(round_outcomes, ROUND_OUTCOME_COLUMNS)
+
+
+def match_records_to_dataframe(records: Iterable[Tuple[Match, MatchMap, MatchMapPlayer]]) -> pd.DataFrame:
+    """
+    Convert (Match, MatchMap, MatchMapPlayer) records (e.g. from
+    `HltvClient.iter_match_records`) into player rows that also carry the
+    match ID, match date and map name, so they can be partitioned by date.
+    """
+    match_columns = {"hltv_match_id": "int64", "match_date": "datetime64[ns]"}
+    records = list(records)
+    matches, match_maps, players = zip(*records) if len(records) > 0 else ((), (), ())
+    match_df = _to_dataframe(matches, match_columns)
+    map_df = _to_dataframe(match_maps, {"map_number": "Int64", "map_name": "category"})
+    player_df = match_map_players_to_dataframe(players)
+    return pd.concat([match_df, map_df, player_df], axis=1)
+
+
+def match_map_player_batch_to_dataframe(batch: MatchMapPlayerBatch) -> pd.DataFrame:
+    """
+    Convert a MatchMapPlayerBatch into a DataFrame without going through
+    MatchMapPlayer objects. Numeric columns are copied straight from the
+    batch's typed arrays.
+    """
+    columns: Dict[str, Any] = {}
+    for name, column in batch.columns.items():
+        values = np.frombuffer(column, dtype=np.int64 if column.typecode == "q" else np.float64)
+        columns[name] = values.copy()
+    df = pd.DataFrame(columns)
+    df["flash_assists"] = df["flash_assists"].astype("Int64").mask(df["flash_assists"] == -1)
+    df["side"] = pd.Categorical(batch.sides)
+    return df
+
+
+def to_arrow_table(df: pd.DataFrame) -> pa.Table:
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def iter_dataframes(
+    records: Iterable[Any], to_dataframe: Callable[[Iterable[Any]], pd.DataFrame], chunk_size: int = 10000
+) -> Iterator[pd.DataFrame]:
+    """
+    Convert a stream of records into DataFrames of at most `chunk_size` rows,
+    so a long crawl can be written out without holding every record in memory.
+    """
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if len(chunk) == 0:
+            return
+        yield to_dataframe(chunk)
+
+
+def write_parquet(df: pd.DataFrame, root_path: str, date_column: Optional[str] = "match_date"):
+    """
+    Write a DataFrame to a Parquet dataset under `root_path`, partitioned by
+    the month of `date_column` (e.g. "match_month=2023-04/"). Each call adds
+    new files, so chunks from `iter_dataframes` can be written one at a time.
+    Pass `date_column=None` to write without partitioning.
+    """
+    partition_cols = None
+    if date_column is not None:
+        df = df.assign(match_month=df[date_column].dt.strftime("%Y-%m"))
+        partition_cols = ["match_month"]
+    pq.write_to_dataset(
+        to_arrow_table(df),
+        root_path=root_path,
+        partition_cols=partition_cols,
+        basename_template=f"part-{uuid4().hex}-{{i}}.parquet",
+    )
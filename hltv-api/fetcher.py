@@ -0,0 +1,127 @@
+import asyncio
+import re
+from abc import ABC, abstractmethod
+from typing import List
+
+# Page titles of Cloudflare challenge and block pages. Only the title is
+# checked: Cloudflare also injects its challenge scripts into normal pages.
+BLOCKED_PAGE_TITLES: List[str] = [
+    "Just a moment...",
+    "Attention Required! | Cloudflare",
+    "Access denied",
+    "Too Many Requests",
+]
+
+# Page titles of HLTV's (and its Cloudflare proxy's) error pages, compared
+# case-insensitively. A missing page will not appear by fetching it again.
+NOT_FOUND_PAGE_TITLES: List[str] = ["404 Not Found", "404 -", "404 |", "Page not found"]
+SERVER_ERROR_PAGE_TITLES: List[str] = [
+    "500 Internal Server Error",
+    "502 Bad Gateway",
+    "503 Service Unavailable",
+    "503 Service Temporarily Unavailable",
+    "504 Gateway Time-out",
+    # Cloudflare error pages, e.g. "hltv.org | 502: Bad gateway"
+    "| 500:",
+    "| 502:",
+    "| 503:",
+    "| 504:",
+    "| 520:",
+    "| 521:",
+    "| 522:",
+    "| 523:",
+    "| 524:",
+]
+
+_TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+class FetchError(Exception):
+    """
+    Raised when a fetcher cannot get the source of a page. `retryable` is
+    False when fetching the page again will not help (e.g. a 404).
+    """
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable: bool = retryable
+
+
+class BlockedPageError(FetchError):
+    """
+    Raised when HLTV returns a challenge or block page instead of the requested page.
+    """
+
+
+def check_page_source(url: str, page_source: str):
+    """
+    Raise BlockedPageError if a fetched page is a challenge or block page, and
+    FetchError if it is an error page (not retryable for a missing page).
+    Browsers load error pages like any other page, so this is the only way a
+    browser backend can tell them apart.
+    """
+    title_match = _TITLE_PATTERN.search(page_source)
+    if title_match is None:
+        return
+    title = " ".join(title_match.group(1).split())
+    for blocked_title in BLOCKED_PAGE_TITLES:
+        if blocked_title in title:
+            raise BlockedPageError(f"Blocked page returned for {url} ({title})")
+    lower_title = title.lower()
+    for not_found_title in NOT_FOUND_PAGE_TITLES:
+        if not_found_title.lower() in lower_title:
+            raise FetchError(f"Page not found for {url} ({title})", retryable=False)
+    for server_error_title in SERVER_ERROR_PAGE_TITLES:
+        if server_error_title.lower() in lower_title:
+            raise FetchError(f"Error page returned for {url} ({title})")
+
+
+class Fetcher(ABC):
+    """
+    A backend that gets the source of HLTV pages. The client only parses page
+    sources, so any backend that returns the page HTML can be used.
+    """
+
+    @abstractmethod
+    def get_page_source(self, url: str) -> str:
+        """
+        Get the HTML source of the page at `url`.
+        """
+
+    def quit(self):
+        """
+        Release any resources (browsers, connections) held by the fetcher.
+        """
+
+
+class AsyncFetcher(ABC):
+    """
+    A backend that gets the source of HLTV pages without blocking the event loop.
+    """
+
+    @abstractmethod
+    async def get_page_source(self, url: str) -> str:
+        """
+        Get the HTML source of the page at `url`.
+        """
+
+    async def close(self):
+        """
+        Release any resources (browsers, connections) held by the fetcher.
+        """
+
+
+class ThreadedFetcher(AsyncFetcher):
+    """
+    Runs a blocking Fetcher (e.g. ChromeFetcher) in a worker thread so it can
+    be used from asyncio code.
+    """
+
+    def __init__(self, fetcher: Fetcher):
+        self.fetcher: Fetcher = fetcher
+
+    async def get_page_source(self, url: str) -> str:
+        return await asyncio.to_thread(self.fetcher.get_page_source, url)
+
+    async def close(self):
+        await asyncio.to_thread(self.fetcher.quit)
@@ -0,0 +1,61 @@
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Optional
+
+from fetcher import FetchError, Fetcher
+
+DEFAULT_HEADERS: Dict[str, str] = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class HttpFetcher(Fetcher):
+    """
+    Fetches pages with plain HTTP requests over a pool of keep-alive
+    connections. Much cheaper to start and run than a browser, and safe to
+    share between threads.
+    """
+
+    def __init__(
+        self, headers: Optional[Dict[str, str]] = None, timeout: float = 15, pool_size: int = 10
+    ):
+        """
+        Initialize a new HttpFetcher object.
+
+        Parameters
+        ----------
+        headers : Optional[Dict[str, str]]
+            Headers to send with every request. Overrides the matching DEFAULT_HEADERS entries.
+
+        timeout : float
+            Maximum number of seconds to wait for a response.
+
+        pool_size : int
+            Maximum number of connections to keep open to each host.
+        """
+        self.timeout: float = timeout
+        self._session = requests.Session()
+        self._session.headers.update({**DEFAULT_HEADERS, **(headers or {})})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def quit(self):
+        self._session.close()
+
+    def get_page_source(self, url: str) -> str:
+        try:
+            response = self._session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise FetchError(f"Request for {url} failed: {e}") from e
+        if response.status_code != 200:
+            raise FetchError(
+                f"Request for {url} returned status {response.status_code}",
+                retryable=response.status_code != 404,
+            )
+        return response.text
@@ -1,13 +1,30 @@
 from datetime import datetime
-from selenium.webdriver.chrome.webdriver import WebDriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webelement import WebElement
-from time import sleep
-from typing import List, Optional, Union
+from lxml.html import HtmlElement
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
+from dom import find_element, find_elements, get_text
 from match_map import MatchMap
+from match_map_player import MatchMapPlayer
 from pick_ban import PickBan
-from utils import get_id_from_event_url, get_id_from_match_url, get_id_from_team_url
+from utils import get_id_from_event_url, get_id_from_match_url, get_id_from_team_url, intern_name
+
+
+def get_match_map_urls(page: HtmlElement) -> List[str]:
+    """
+    Get the URLs of the match map stats pages linked from a parsed match page.
+    """
+    return [map_link.get("href") for map_link in find_elements(page, class_name="results-stats")]
+
+
+def is_skipped_match(page: HtmlElement) -> bool:
+    """
+    Whether a parsed match page is for a match that had a forfeiture, was a
+    showmatch, etc. and has no stats to collect.
+    """
+    skip_keywords = ["forfeit", "default", "withdrew", "withdraw", "showmatch"]
+    # The veto box will state if the match had a forfeiture, was a showmatch, etc.
+    veto_text = get_text(find_element(page, class_name="veto-box"))
+    return any(map(veto_text.__contains__, skip_keywords))
 
 
 class Match:
@@ -16,35 +33,46 @@ class Match:
     teams playing, and the final
     """
 
-    def __init__(self, driver: WebDriver, url: str):
+    def __init__(
+        self,
+        page: HtmlElement,
+        url: str,
+        map_page_loader: Optional[Callable[[str], HtmlElement]],
+        prefetch_maps: bool = False,
+    ):
         """
         Initialize a new Match object.
 
         Parameters
         ----------
-        driver : WebDriver
-            The Selenium WebDriver instance to use to fetch the data.
+        page : HtmlElement
+            The parsed HTML of the match page.
 
         url : str
             The URL of the match page.
+
+        map_page_loader : Callable[[str], HtmlElement]
+            Returns the parsed HTML of a match map stats page given its URL.
+            Map stats pages are only loaded once `match_maps` is first accessed.
+            None if they are loaded later with `load_match_maps`.
+
+        prefetch_maps : bool
+            Load the map stats pages immediately instead of on first access.
         """
-        print(f"Getting match from {url}...")
-        driver.get(url)
-        sleep(5)
-        print("Done waiting for page to load!")
-
-        skip_keywords = ["forfeit", "default", "withdrew", "withdraw", "showmatch"]
-        # The veto box will state if the match had a forfeiture, was a showmatch, etc.
-        veto_text = driver.find_element(By.CLASS_NAME, "veto-box").text
-        if any(map(veto_text.__contains__, skip_keywords)):
+        self.skipped: bool = False
+        self._map_page_loader: Optional[Callable[[str], HtmlElement]] = None
+        self._match_maps: Optional[List[MatchMap]] = None
+        # Skipped matches keep their ID so that they can be stored as seen
+        self.hltv_match_id: int = get_id_from_match_url(url)
+        self.url: str = url
+        if is_skipped_match(page):
             self.skipped = True
+            self._match_maps = []
             return
 
-        self.hltv_match_id: int = get_id_from_match_url(url)
-        self.match_date: datetime = self._get_match_date(driver)
-        self.url: str = url
-        self.hltv_event_id: int = self._get_hltv_event_id(driver)
-        self.best_of: Optional[int] = self._get_best_of(driver)
+        self.match_date: datetime = self._get_match_date(page)
+        self.hltv_event_id: int = self._get_hltv_event_id(page)
+        self.best_of: Optional[int] = self._get_best_of(page)
 
         self.team1_name: Optional[str] = None
         self.team1_hltv_team_id: Optional[int] = None
@@ -54,74 +82,125 @@ class Match:
         self.team2_hltv_team_id: Optional[int] = None
         self.team2_maps_won: Optional[int] = None
         self.team2_world_rank: Optional[int] = None
-        self._set_team_values(team_num=1, driver=driver)
-        self._set_team_values(team_num=2, driver=driver)
-
-        self.pick_bans: List[PickBan] = self._get_pick_bans(driver)
-        self.match_maps: List[MatchMap] = self._get_match_maps(driver)
-
-    def _set_team_values(self, driver: WebDriver, team_num: int):
-        teams_div = driver.find_element(By.XPATH, "//div[@class='standard-box teamsBox']")
-        team_div = teams_div.find_elements(By.CLASS_NAME, "team")[team_num - 1]
-        setattr(self, f"team{team_num}_name", team_div.find_element(By.CLASS_NAME, "teamName").text)
+        self._set_team_values(team_num=1, page=page)
+        self._set_team_values(team_num=2, page=page)
+
+        self.pick_bans: List[PickBan] = self._get_pick_bans(page)
+        self.match_map_urls: List[str] = get_match_map_urls(page)
+        self._map_page_loader = map_page_loader
+        if prefetch_maps:
+            self._load_match_maps()
+
+    @property
+    def match_maps(self) -> List[MatchMap]:
+        if self._match_maps is None:
+            self._load_match_maps()
+        return self._match_maps
+
+    def load_match_maps(self, map_page_loader: Callable[[str], HtmlElement]):
+        """
+        Load the map stats pages with `map_page_loader`. For matches created
+        without a loader, or unpickled before their maps were loaded.
+        """
+        if self.skipped:
+            return
+        self._map_page_loader = map_page_loader
+        self._load_match_maps()
+
+    def _load_match_maps(self):
+        if self._map_page_loader is None:
+            raise RuntimeError(f"No map page loader to load the map stats pages of {self.url}")
+        self._match_maps = self._get_match_maps()
+        # The loader (e.g. a client's page getter) is no longer needed, and
+        # dropping it keeps the match picklable
+        self._map_page_loader = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # A loader may hold a client or browser, which cannot be pickled. A
+        # match unpickled before its maps were loaded needs `load_match_maps`.
+        state = self.__dict__.copy()
+        state["_map_page_loader"] = None
+        return state
+
+    def iter_player_records(
+        self, sides: Tuple[str, ...] = ("Both",)
+    ) -> Iterator[Tuple["Match", MatchMap, MatchMapPlayer]]:
+        """
+        Iterate over (Match, MatchMap, MatchMapPlayer) records, one per player
+        per map for each of `sides` ("Both", "T", "CT").
+        """
+        if self.skipped:
+            return
+        for match_map in self.match_maps:
+            for side in sides:
+                for team_num in (1, 2):
+                    for player in match_map.get_map_players(team_num=team_num, side=side):
+                        yield self, match_map, player
+
+    def _set_team_values(self, page: HtmlElement, team_num: int):
+        teams_div = find_element(page, class_name="teamsBox")
+        team_div = find_elements(teams_div, class_name="team")[team_num - 1]
+        team_name = intern_name(get_text(find_element(team_div, class_name="teamName")))
+        setattr(self, f"team{team_num}_name", team_name)
         setattr(self, f"team{team_num}_hltv_team_id", self._get_hltv_team_id(team_div))
         setattr(self, f"team{team_num}_maps_won", self._get_team_maps_won(team_div))
-        rank_text = driver.find_elements(By.CLASS_NAME, "teamRanking")[team_num - 1].text
+        rank_text = get_text(find_elements(page, class_name="teamRanking")[team_num - 1])
         if rank_text != "Unranked":
             # Parse rank value from text (e.g. "World rank: #35")
             setattr(self, f"team{team_num}_world_rank", int(rank_text.split("#")[1]))
 
-    def _get_match_date(self, driver: WebDriver) -> datetime:
-        date_div = driver.find_element(By.CLASS_NAME, "date")
-        timestamp = float(date_div.get_attribute("data-unix")) / 1000
+    def _get_match_date(self, page: HtmlElement) -> datetime:
+        date_div = find_element(page, class_name="date")
+        timestamp = float(date_div.get("data-unix")) / 1000
         return datetime.fromtimestamp(timestamp)
 
-    def _get_best_of(self, driver: WebDriver) -> int | None:
-        best_of_div = driver.find_element(By.CLASS_NAME, "preformatted-text")
-        if "Best of " in best_of_div.text:
-            return int(best_of_div.text.split("Best of ")[1][0])
+    def _get_best_of(self, page: HtmlElement) -> int | None:
+        best_of_text = get_text(find_element(page, class_name="preformatted-text"))
+        if "Best of " in best_of_text:
+            return int(best_of_text.split("Best of ")[1][0])
         return None
 
-    def _get_hltv_event_id(self, driver: WebDriver) -> int:
-        event_div = driver.find_element(By.CLASS_NAME, "event")
-        event_link = event_div.find_element(By.TAG_NAME, "a")
-        event_url = event_link.get_attribute("href")
+    def _get_hltv_event_id(self, page: HtmlElement) -> int:
+        event_div = find_element(page, class_name="event")
+        event_link = find_element(event_div, tag_name="a")
+        event_url = event_link.get("href")
         return get_id_from_event_url(event_url)
 
-    def _get_hltv_team_id(self, team_div: WebElement) -> int:
-        team_url = team_div.find_element(By.TAG_NAME, "a").get_attribute("href")
+    def _get_hltv_team_id(self, team_div: HtmlElement) -> int:
+        team_url = find_element(team_div, tag_name="a").get("href")
         hltv_team_id = get_id_from_team_url(team_url)
         return hltv_team_id
 
-    def _get_team_maps_won(self, team_div: WebElement) -> Union[int, None]:
-        won_divs = team_div.find_elements(By.CLASS_NAME, "won")
-        lost_divs = team_div.find_elements(By.CLASS_NAME, "lost")
+    def _get_team_maps_won(self, team_div: HtmlElement) -> Union[int, None]:
+        won_divs = find_elements(team_div, class_name="won")
+        lost_divs = find_elements(team_div, class_name="lost")
         map_wins = None
         if len(won_divs) > 0:
-            map_wins = int(won_divs[0].text)
+            map_wins = int(get_text(won_divs[0]))
         elif len(lost_divs) > 0:
-            map_wins = int(lost_divs[0].text)
+            map_wins = int(get_text(lost_divs[0]))
         return map_wins
 
-    def _get_pick_bans(self, driver: WebDriver) -> List[PickBan]:
+    def _get_pick_bans(self, page: HtmlElement) -> List[PickBan]:
         # Pick/bans are nested in the second "veto-box" div
-        veto_box_div = driver.find_elements(By.CLASS_NAME, "veto-box")[1]
-        veto_box_inner_div = veto_box_div.find_element(By.CLASS_NAME, "padding")
+        veto_box_div = find_elements(page, class_name="veto-box")[1]
+        veto_box_inner_div = find_element(veto_box_div, class_name="padding")
         pick_number = 0
         pick_bans: List[PickBan] = []
         # Last pick/ban div is the decider map, which can be ignored
-        for pb_div in veto_box_inner_div.find_elements(By.TAG_NAME, "div")[:-1]:
+        for pb_div in find_elements(veto_box_inner_div, tag_name="div")[:-1]:
             pick_number += 1
             hltv_team_id = None
-            team_name = " ".join(pb_div.text.split()[1:-2])
+            pb_text = get_text(pb_div)
+            team_name = " ".join(pb_text.split()[1:-2])
             if team_name == self.team1_name:
                 hltv_team_id = self.team1_hltv_team_id
             elif team_name == self.team2_name:
                 hltv_team_id = self.team2_hltv_team_id
             if hltv_team_id == None:
                 continue
-            pick_type = "Pick" if "picked" in pb_div.text else "Ban"
-            map_name = pb_div.text.split()[-1]
+            pick_type = "Pick" if "picked" in pb_text else "Ban"
+            map_name = intern_name(pb_text.split()[-1])
             pb = PickBan(
                 hltv_match_id=self.hltv_match_id,
                 pick_number=pick_number,
@@ -132,12 +211,13 @@ class Match:
             pick_bans.append(pb)
         return pick_bans
 
-    def _get_match_maps(self, driver: WebDriver) -> List[MatchMap]:
-        map_links = driver.find_elements(By.CLASS_NAME, "results-stats")
-        map_urls = [map_link.get_attribute("href") for map_link in map_links]
+    def _get_match_maps(self) -> List[MatchMap]:
         match_maps: List[MatchMap] = []
-        for map_url in map_urls:
-            match_map = MatchMap(driver=driver, url=map_url, match_id=self.hltv_match_id)
+        for map_url in self.match_map_urls:
+            match_map = MatchMap(
+                page=self._map_page_loader(map_url),
+                url=map_url,
+                match_id=self.hltv_match_id,
+            )
             match_maps.append(match_map)
-            sleep(5)
         return match_maps
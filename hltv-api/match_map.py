@@ -1,11 +1,22 @@
-from selenium.webdriver.chrome.webdriver import WebDriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webelement import WebElement
-from time import sleep
-from typing import List, Optional
+from lxml.html import HtmlElement
+from typing import Dict, List, Optional, Tuple
 
+from dom import find_element, find_elements, get_text
 from match_map_player import MatchMapPlayer
-from utils import get_id_from_match_map_url, get_id_from_match_url, get_id_from_team_url
+from round_outcome import RoundOutcome, get_round_outcome_type
+from utils import get_id_from_match_map_url, get_id_from_match_url, get_id_from_team_url, intern_name
+
+
+def _get_stats_table_side(stats_table: HtmlElement) -> str:
+    """
+    Get the side ("Both", "T" or "CT") of a player stats table from its classes.
+    """
+    class_names = stats_table.get("class", "").split()
+    if "tstats" in class_names:
+        return "T"
+    if "ctstats" in class_names:
+        return "CT"
+    return "Both"
 
 
 class MatchMap:
@@ -14,14 +25,39 @@ class MatchMap:
     team round wins, and team-based stats.
     """
 
-    def __init__(self, driver: WebDriver, url: str, match_id: int):
+    __slots__ = (
+        "hltv_match_map_id",
+        "hltv_match_id",
+        "map_number",
+        "map_name",
+        "team1_hltv_team_id",
+        "team1_rounds_won",
+        "team2_hltv_team_id",
+        "team2_rounds_won",
+        "team1_1h_side",
+        "team1_1h_rounds_won",
+        "team1_2h_side",
+        "team1_2h_rounds_won",
+        "team2_1h_side",
+        "team2_1h_rounds_won",
+        "team2_2h_side",
+        "team2_2h_rounds_won",
+        "team1_bombs_exploded",
+        "team1_bombs_defused",
+        "team2_bombs_exploded",
+        "team2_bombs_defused",
+        "round_outcomes",
+        "_map_players",
+    )
+
+    def __init__(self, page: HtmlElement, url: str, match_id: int):
         """
         Initialize a new MatchMap object.
 
         Parameters
         ----------
-        driver : WebDriver
-            The Selenium WebDriver instance to use to fetch the match data.
+        page : HtmlElement
+            The parsed HTML of HLTV's match map stats page.
 
         url : str
             The URL of HLTV's match map stats page.
@@ -29,24 +65,21 @@ class MatchMap:
         match_id : int
             The HLTV ID of the match.
         """
-        driver.get(url)
-        sleep(5)
-
         self.hltv_match_map_id: int = get_id_from_match_map_url(url)
         self.hltv_match_id: Optional[int] = match_id
 
         self.map_number: Optional[int] = None
         self.map_name: Optional[str] = None
         # self.map_picked_by: Optional[int] = None
-        self._set_map_attributes(driver)
+        self._set_map_attributes(page)
 
         self.team1_hltv_team_id: Optional[int] = None
         self.team1_rounds_won: Optional[int] = None
-        self._set_team_ids_and_rounds_won(driver=driver, team_num=1)
+        self._set_team_ids_and_rounds_won(page=page, team_num=1)
 
         self.team2_hltv_team_id: Optional[int] = None
         self.team2_rounds_won: Optional[int] = None
-        self._set_team_ids_and_rounds_won(driver=driver, team_num=2)
+        self._set_team_ids_and_rounds_won(page=page, team_num=2)
 
         self.team1_1h_side: Optional[str] = None  # "T" or "CT"
         self.team1_1h_rounds_won: Optional[int] = None
@@ -56,7 +89,7 @@ class MatchMap:
         self.team2_1h_rounds_won: Optional[int] = None
         self.team2_2h_side: Optional[str] = None
         self.team2_2h_rounds_won: Optional[int] = None
-        self._set_team_1h_2h_data(driver)
+        self._set_team_1h_2h_data(page)
 
         # self.team1_kills: Optional[int] = None
         # self.team1_assists: Optional[int] = None
@@ -70,106 +103,162 @@ class MatchMap:
         self.team1_bombs_defused: Optional[int] = None
         self.team2_bombs_exploded: Optional[int] = None
         self.team2_bombs_defused: Optional[int] = None
-        self._set_team_bomb_stats(driver)
+        self.round_outcomes: List[RoundOutcome] = self._get_round_outcomes(page)
+        self._set_team_bomb_stats()
+
+        # Player stats keyed by (team number, side), where side is "Both", "T" or "CT".
+        # Parsed now so that the page is not kept alive by the MatchMap.
+        self._map_players: Dict[Tuple[int, str], List[MatchMapPlayer]] = self._get_map_players_by_side(page)
+
+    @property
+    def team1_map_players(self) -> List[MatchMapPlayer]:
+        return self.get_map_players(team_num=1, side="Both")
 
-        self.team1_map_players: List[MatchMapPlayer] = self._get_match_map_players(
-            driver=driver, hltv_match_map_id=self.hltv_match_map_id, team_num=1, side="Both"
-        )
-        self.team2_map_players: List[MatchMapPlayer] = self._get_match_map_players(
-            driver=driver, hltv_match_map_id=self.hltv_match_map_id, team_num=2, side="Both"
-        )
+    @property
+    def team2_map_players(self) -> List[MatchMapPlayer]:
+        return self.get_map_players(team_num=2, side="Both")
+
+    def get_map_players(self, team_num: int, side: str = "Both") -> List[MatchMapPlayer]:
+        """
+        Get a team's player stats for one side ("Both", "T" or "CT"). Pages
+        without side-split tables only have "Both" stats.
+        """
+        return self._map_players.get((team_num, side), [])
 
     def __str__(self) -> str:
         s: str = "MatchMap:\n"
-        attrs = vars(self)
-        for key, value in attrs.items():
-            s += f"{str(key)}: {str(value)}\n"
+        for key in self.__slots__:
+            if key.startswith("_"):
+                continue
+            s += f"{key}: {str(getattr(self, key))}\n"
         s += "\n"
         return s
 
-    def _get_hltv_match_id(self, driver: WebDriver) -> int:
-        match_link = driver.find_element(By.CLASS_NAME, "match-page-link")
-        match_url = match_link.get_attribute("href")
+    def _get_map_players_by_side(self, page: HtmlElement) -> Dict[Tuple[int, str], List[MatchMapPlayer]]:
+        # There are up to 6 stat tables, team 1's before team 2's for each side.
+        # Every table has the "totalstats" class; the side tables (hidden by
+        # default) also have "tstats" or "ctstats". All of them are found in a
+        # single pass over the page.
+        stats_tables_by_side: Dict[str, List[HtmlElement]] = {"Both": [], "T": [], "CT": []}
+        for stats_table in find_elements(page, class_name="stats-table"):
+            stats_tables_by_side[_get_stats_table_side(stats_table)].append(stats_table)
+        map_players: Dict[Tuple[int, str], List[MatchMapPlayer]] = {}
+        for side, stats_tables in stats_tables_by_side.items():
+            for team_num, stats_table in zip((1, 2), stats_tables):
+                map_players[(team_num, side)] = self._get_match_map_players(
+                    stats_table=stats_table,
+                    hltv_match_map_id=self.hltv_match_map_id,
+                    team_num=team_num,
+                    side=side,
+                )
+        return map_players
+
+    def _get_hltv_match_id(self, page: HtmlElement) -> int:
+        match_link = find_element(page, class_name="match-page-link")
+        match_url = match_link.get("href")
         hltv_match_id = get_id_from_match_url(match_url)
         return hltv_match_id
 
-    def _set_map_attributes(self, driver: WebDriver):
-        match_info_box = driver.find_element(By.CLASS_NAME, "match-info-box")
-        map_name = match_info_box.text.split("Map")[1].split("\n")[1].strip()
-        map_divs = driver.find_elements(By.CLASS_NAME, "stats-match-map")
+    def _set_map_attributes(self, page: HtmlElement):
+        match_info_box = find_element(page, class_name="match-info-box")
+        # The map name is the first line of text following the "Map" label
+        map_name = match_info_box.text_content().split("Map")[1].strip().split("\n")[0].strip()
+        map_divs = find_elements(page, class_name="stats-match-map")
         if len(map_divs) == 0:  # Best of 1
             self.map_number = 1
-            self.map_name = map_name
+            self.map_name = intern_name(map_name)
             return
         map_divs = map_divs[1:]  # First div contains the series score. Ignore
         map_num = 0
-        active_map_div: Optional[WebElement] = None
+        active_map_div: Optional[HtmlElement] = None
         for i in range(0, len(map_divs)):
-            if "inactive" not in map_divs[i].get_attribute("class"):
+            if "inactive" not in map_divs[i].get("class", ""):
                 map_num = i + 1
                 active_map_div = map_divs[i]
                 break
         if active_map_div != None:
             self.map_number = map_num
-            self.map_name = active_map_div.find_element(By.CLASS_NAME, "dynamic-map-name-full").text
+            self.map_name = intern_name(get_text(find_element(active_map_div, class_name="dynamic-map-name-full")))
 
-    def _set_team_ids_and_rounds_won(self, driver: WebDriver, team_num):
+    def _set_team_ids_and_rounds_won(self, page: HtmlElement, team_num):
         div_side = "left" if team_num == 1 else "right"
-        team_div = driver.find_element(By.CLASS_NAME, f"team-{div_side}")
-        team_link = team_div.find_element(By.TAG_NAME, "a")
-        team_url = team_link.get_attribute("href")
-        rounds_won = int(team_div.find_element(By.TAG_NAME, "div").text)
+        team_div = find_element(page, class_name=f"team-{div_side}")
+        team_link = find_element(team_div, tag_name="a")
+        team_url = team_link.get("href")
+        rounds_won = int(get_text(find_element(team_div, tag_name="div")))
         setattr(self, f"team{team_num}_hltv_team_id", get_id_from_team_url(team_url))
         setattr(self, f"team{team_num}_rounds_won", rounds_won)
 
-    def _set_team_1h_2h_data(self, driver: WebDriver):
+    def _set_team_1h_2h_data(self, page: HtmlElement):
         # Rounds won by side
-        match_info_box_div = driver.find_element(By.CLASS_NAME, "match-info-box-con")
-        match_info_row_divs = match_info_box_div.find_elements(By.CLASS_NAME, "match-info-row")
+        match_info_box_div = find_element(page, class_name="match-info-box-con")
+        match_info_row_divs = find_elements(match_info_box_div, class_name="match-info-row")
         round_breakdown_div = match_info_row_divs[0]
-        round_spans = round_breakdown_div.find_elements(By.TAG_NAME, "span")
+        round_spans = find_elements(round_breakdown_div, tag_name="span")
         # span 1: Team 1 rounds won
         # span 2: Team 2 rounds won
         # span 3: Team 1 first half rounds won (class name will indicate side- "t-color" or "ct-color")
         # span 4: Team 2 first half rounds won
         # span 5: Team 1 second half rounds won
         # span 6: Team 2 second half rounds won
-        self.team1_1h_side = round_spans[2].get_attribute("class").replace("-color", "").upper()
-        self.team1_1h_rounds_won = int(round_spans[2].text)
-        self.team1_2h_side = round_spans[4].get_attribute("class").replace("-color", "").upper()
-        self.team1_2h_rounds_won = int(round_spans[4].text)
+        self.team1_1h_side = round_spans[2].get("class").replace("-color", "").upper()
+        self.team1_1h_rounds_won = int(get_text(round_spans[2]))
+        self.team1_2h_side = round_spans[4].get("class").replace("-color", "").upper()
+        self.team1_2h_rounds_won = int(get_text(round_spans[4]))
 
-        self.team2_1h_side = round_spans[3].get_attribute("class").replace("-color", "").upper()
-        self.team2_1h_rounds_won = int(round_spans[3].text)
-        self.team2_2h_side = round_spans[5].get_attribute("class").replace("-color", "").upper()
-        self.team2_2h_rounds_won = int(round_spans[5].text)
+        self.team2_1h_side = round_spans[3].get("class").replace("-color", "").upper()
+        self.team2_1h_rounds_won = int(get_text(round_spans[3]))
+        self.team2_2h_side = round_spans[5].get("class").replace("-color", "").upper()
+        self.team2_2h_rounds_won = int(get_text(round_spans[5]))
+
+    def _get_round_outcomes(self, page: HtmlElement) -> List[RoundOutcome]:
+        # Each team has a round history row with one image per round. The image
+        # shows how the round was won, or is empty if the other team won it.
+        round_history_team_divs = find_elements(page, class_name="round-history-team-row")
+        team_round_images = [
+            find_elements(team_div, class_name="round-history-outcome")
+            for team_div in round_history_team_divs[:2]
+        ]
+        if len(team_round_images) < 2:
+            return []
+        team_ids = {1: self.team1_hltv_team_id, 2: self.team2_hltv_team_id}
+        round_outcomes: List[RoundOutcome] = []
+        for round_index, round_images in enumerate(zip(*team_round_images)):
+            for team_num, round_image in enumerate(round_images, start=1):
+                outcome_type = get_round_outcome_type(round_image.get("src", ""))
+                if outcome_type is None:
+                    continue
+                side, win_type = outcome_type
+                round_outcomes.append(
+                    RoundOutcome(
+                        hltv_match_map_id=self.hltv_match_map_id,
+                        round_number=round_index + 1,
+                        winner_team_num=team_num,
+                        winner_hltv_team_id=team_ids[team_num],
+                        side=side,
+                        win_type=win_type,
+                    )
+                )
+                break
+        return round_outcomes
 
-    def _set_team_bomb_stats(self, driver: WebDriver):
+    def _set_team_bomb_stats(self):
         # Bombs exploded & defused
-        round_history_team_divs = driver.find_elements(By.CLASS_NAME, "round-history-team-row")
-        self.team1_bombs_exploded = self.get_bombs_exploded(round_history_team_divs[0])
-        self.team1_bombs_defused = self.get_bombs_defused(round_history_team_divs[0])
-        self.team2_bombs_exploded = self.get_bombs_exploded(round_history_team_divs[1])
-        self.team2_bombs_defused = self.get_bombs_defused(round_history_team_divs[1])
-
-    def get_bombs_defused(self, round_history_div: WebElement) -> int:
-        round_images = round_history_div.find_elements(By.TAG_NAME, "img")
-        bombs_defused = 0
-        for round_image in round_images:
-            if "bomb_defused" in round_image.get_attribute("src"):
-                bombs_defused += 1
-        return bombs_defused
-
-    def get_bombs_exploded(self, round_history_div: WebElement) -> int:
-        round_images = round_history_div.find_elements(By.TAG_NAME, "img")
-        bombs_exploded = 0
-        for round_image in round_images:
-            if "bomb_exploded" in round_image.get_attribute("src"):
-                bombs_exploded += 1
-        return bombs_exploded
+        self.team1_bombs_exploded = 0
+        self.team1_bombs_defused = 0
+        self.team2_bombs_exploded = 0
+        self.team2_bombs_defused = 0
+        for round_outcome in self.round_outcomes:
+            if round_outcome.win_type == "bomb_exploded":
+                attr = f"team{round_outcome.winner_team_num}_bombs_exploded"
+            elif round_outcome.win_type == "bomb_defused":
+                attr = f"team{round_outcome.winner_team_num}_bombs_defused"
+            else:
+                continue
+            setattr(self, attr, getattr(self, attr) + 1)
 
     def _get_match_map_players(
-        self, driver: WebDriver, hltv_match_map_id: int, team_num: int, side: str
+        self, stats_table: HtmlElement, hltv_match_map_id: int, team_num: int, side: str
     ) -> List[MatchMapPlayer]:
         # hltv_team_id = self.team1_hltv_team_id if team_num == 1 else self.team2_hltv_team_id
 
@@ -182,17 +271,7 @@ class MatchMap:
         if hltv_team_id == None:
             return []
 
-        # There are 6 stat tables, in this order:
-        # 1. Team 1 both sides
-        # 2. Team 1 T side (hidden by default)
-        # 3. Team 1 CT side (hidden by default)
-        # 4. Team 2 both sides
-        # 5. Team 2 T side (hidden by default)
-        # 6. Team 2 CT side (hidden by default)
-        table_index = (team_num - 1) * 3 + (0 if side == "Both" else 1 if side == "T" else 2)
-
-        stats_table = driver.find_elements(By.CLASS_NAME, "stats-table")[table_index]
-        player_trs = stats_table.find_element(By.TAG_NAME, "tbody").find_elements(By.TAG_NAME, "tr")
+        player_trs = find_elements(find_element(stats_table, tag_name="tbody"), tag_name="tr")
 
         players: List[MatchMapPlayer] = []
         for tr in player_trs:
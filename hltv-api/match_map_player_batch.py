@@ -0,0 +1,72 @@
+from array import array
+from sys import intern
+from typing import Dict, Iterable, Iterator, List
+
+from match_map_player import MatchMapPlayer
+
+# Typecodes of the numeric columns: "q" for signed 64-bit ints, "d" for doubles.
+# Missing flash assists are stored as -1.
+COLUMN_TYPECODES: Dict[str, str] = {
+    "hltv_player_id": "q",
+    "hltv_match_map_id": "q",
+    "hltv_team_id": "q",
+    "kills": "q",
+    "assists": "q",
+    "flash_assists": "q",
+    "deaths": "q",
+    "headshots": "q",
+    "first_kills": "q",
+    "first_deaths": "q",
+    "kast_percent": "d",
+    "adr": "d",
+    "hltv_rating": "d",
+}
+
+
+class MatchMapPlayerBatch:
+    """
+    Columnar storage of many MatchMapPlayer rows. Each stat is kept in a typed
+    array instead of one object per row, for bulk analytics over large archives.
+    """
+
+    def __init__(self, players: Iterable[MatchMapPlayer] = ()):
+        """
+        Initialize a new MatchMapPlayerBatch object.
+
+        Parameters
+        ----------
+        players : Iterable[MatchMapPlayer]
+            Rows to add to the batch.
+        """
+        self.columns: Dict[str, array] = {
+            name: array(typecode) for name, typecode in COLUMN_TYPECODES.items()
+        }
+        self.sides: List[str] = []
+        self.extend(players)
+
+    def __len__(self) -> int:
+        return len(self.sides)
+
+    def __getitem__(self, column_name: str) -> array:
+        return self.columns[column_name]
+
+    def append(self, player: MatchMapPlayer):
+        for name, column in self.columns.items():
+            value = getattr(player, name)
+            column.append(-1 if value is None else value)
+        self.sides.append(intern(player.side))
+
+    def extend(self, players: Iterable[MatchMapPlayer]):
+        for player in players:
+            self.append(player)
+
+    def row(self, index: int) -> Dict[str, object]:
+        values: Dict[str, object] = {name: column[index] for name, column in self.columns.items()}
+        if values["flash_assists"] == -1:
+            values["flash_assists"] = None
+        values["side"] = self.sides[index]
+        return values
+
+    def rows(self) -> Iterator[Dict[str, object]]:
+        for index in range(len(self)):
+            yield self.row(index)
@@ -0,0 +1,168 @@
+import json
+import logging
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter, time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# A metric's labels, sorted by name so they can be used as a dict key
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class MetricEvent:
+    """
+    A single counter increment or timer observation.
+    """
+
+    def __init__(self, kind: str, name: str, labels: Dict[str, str], value: float):
+        self.kind: str = kind  # "counter" or "timer"
+        self.name: str = name
+        self.labels: Dict[str, str] = labels
+        self.value: float = value
+        self.timestamp: float = time()
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "labels": self.labels,
+            "value": self.value,
+            "timestamp": self.timestamp,
+        }
+
+
+class TimerStats:
+    """
+    Running totals of a timer's observations.
+    """
+
+    def __init__(self):
+        self.count: int = 0
+        self.total_seconds: float = 0
+        self.max_seconds: float = 0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+
+class Metrics:
+    """
+    Collects counters and timers from a crawl, e.g. time spent fetching,
+    waiting and parsing per page type, and the number of pages fetched, cache
+    hits and retries. Every event is also passed to the registered handlers,
+    such as `json_log_handler`. One instance can be shared by several clients.
+    """
+
+    def __init__(self, handlers: Optional[List[Callable[[MetricEvent], None]]] = None):
+        """
+        Initialize a new Metrics object.
+
+        Parameters
+        ----------
+        handlers : Optional[List[Callable[[MetricEvent], None]]]
+            Called with every counter increment and timer observation.
+        """
+        self.handlers: List[Callable[[MetricEvent], None]] = list(handlers or [])
+        self.counters: Dict[Tuple[str, LabelKey], float] = {}
+        self.timers: Dict[Tuple[str, LabelKey], TimerStats] = {}
+        self._lock = Lock()
+
+    def add_handler(self, handler: Callable[[MetricEvent], None]):
+        self.handlers.append(handler)
+
+    def _emit(self, kind: str, name: str, labels: Dict[str, str], value: float):
+        if len(self.handlers) == 0:
+            return
+        event = MetricEvent(kind, name, labels, value)
+        for handler in self.handlers:
+            handler(event)
+
+    def increment(self, name: str, value: float = 1, **labels: str):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+        self._emit("counter", name, labels, value)
+
+    def observe(self, name: str, seconds: float, **labels: str):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            stats = self.timers.get(key)
+            if stats is None:
+                stats = self.timers[key] = TimerStats()
+            stats.add(seconds)
+        self._emit("timer", name, labels, seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """
+        Time the body of a `with` block, e.g.
+        `with metrics.timer("parse", entity="match"): ...`
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - start, **labels)
+
+    def get_counter(self, name: str, **labels: str) -> float:
+        return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def get_timer(self, name: str, **labels: str) -> TimerStats:
+        return self.timers.get((name, tuple(sorted(labels.items()))), TimerStats())
+
+    def to_prometheus_text(self, prefix: str = "hltv_") -> str:
+        """
+        Dump the counters and timers in the Prometheus text exposition format.
+        Timers are written as `<name>_seconds` summaries (count and sum),
+        followed by their maximums as separate `<name>_seconds_max` gauges.
+        """
+
+        def format_labels(label_key: LabelKey) -> str:
+            if len(label_key) == 0:
+                return ""
+            return "{" + ",".join(f'{name}="{value}"' for name, value in label_key) + "}"
+
+        lines: List[str] = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            timers = sorted(self.timers.items(), key=lambda item: item[0])
+        typed_names = set()
+        for (name, label_key), value in counters:
+            metric_name = f"{prefix}{name}_total"
+            if metric_name not in typed_names:
+                lines.append(f"# TYPE {metric_name} counter")
+                typed_names.add(metric_name)
+            lines.append(f"{metric_name}{format_labels(label_key)} {value}")
+        for (name, label_key), stats in timers:
+            metric_name = f"{prefix}{name}_seconds"
+            if metric_name not in typed_names:
+                lines.append(f"# TYPE {metric_name} summary")
+                typed_names.add(metric_name)
+            labels = format_labels(label_key)
+            lines.append(f"{metric_name}_count{labels} {stats.count}")
+            lines.append(f"{metric_name}_sum{labels} {stats.total_seconds}")
+        # A summary has no max sample, so maximums are their own gauge family
+        for (name, label_key), stats in timers:
+            metric_name = f"{prefix}{name}_seconds_max"
+            if metric_name not in typed_names:
+                lines.append(f"# TYPE {metric_name} gauge")
+                typed_names.add(metric_name)
+            lines.append(f"{metric_name}{format_labels(label_key)} {stats.max_seconds}")
+        return "\n".join(lines) + "\n"
+
+
+def json_log_handler(
+    logger: Optional[logging.Logger] = None, level: int = logging.INFO
+) -> Callable[[MetricEvent], None]:
+    """
+    Get a handler that logs every metric event as one line of JSON.
+    """
+    logger = logger or logging.getLogger("hltv.metrics")
+
+    def handle(event: MetricEvent):
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps(event.to_dict()))
+
+    return handle
@@ -0,0 +1,139 @@
+import sqlite3
+import zlib
+from threading import Lock
+from time import time
+from typing import Dict, Optional
+
+from utils import get_id_from_match_map_url, get_id_from_match_url, get_page_type
+
+# Seconds a cached page stays fresh, by page type. None means it never expires.
+DEFAULT_TTLS: Dict[str, Optional[float]] = {
+    "results": 10 * 60,  # New results are added to the first pages constantly
+    "match": None,
+    "match_map": None,  # Map stats pages only exist for completed maps
+    "team": 24 * 60 * 60,  # Rosters and rankings change
+    "player": 24 * 60 * 60,
+    "event": 24 * 60 * 60,
+    "other": 24 * 60 * 60,
+}
+
+
+def get_cache_key(url: str) -> str:
+    """
+    Get the cache key for an HLTV URL. Match and map stats pages are keyed by
+    their HLTV IDs so that URLs differing only by slug share an entry.
+    """
+    page_type = get_page_type(url)
+    if page_type == "match":
+        return f"match:{get_id_from_match_url(url)}"
+    if page_type == "match_map":
+        return f"match_map:{get_id_from_match_map_url(url)}"
+    return f"{page_type}:{url}"
+
+
+class PageCache:
+    """
+    Persistent on-disk cache of page sources keyed by HLTV URL. Pages are
+    stored compressed in a SQLite file and the least recently used pages are
+    evicted once the cache exceeds its size cap.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size_bytes: int = 1024**3,
+        ttls: Optional[Dict[str, Optional[float]]] = None,
+    ):
+        """
+        Initialize a new PageCache object.
+
+        Parameters
+        ----------
+        path : str
+            Path of the SQLite file to store pages in. Created if it does not exist.
+
+        max_size_bytes : int
+            Maximum total size of the compressed pages.
+
+        ttls : Optional[Dict[str, Optional[float]]]
+            Seconds a page stays fresh, by page type ("results", "match",
+            "match_map", "team", "player", "event", "other"). Overrides the matching DEFAULT_TTLS entries.
+        """
+        self.max_size_bytes: int = max_size_bytes
+        self.ttls: Dict[str, Optional[float]] = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                page_type TEXT NOT NULL,
+                url TEXT NOT NULL,
+                content BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS pages_last_accessed_at ON pages (last_accessed_at)"
+        )
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        Get the cached source of a page, or None if it is not cached or has expired.
+        """
+        key = get_cache_key(url)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT page_type, content, stored_at FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or self._is_expired(page_type=row[0], stored_at=row[2]):
+                self.misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE pages SET last_accessed_at = ? WHERE key = ?", (time(), key)
+            )
+            self._connection.commit()
+            self.hits += 1
+        return zlib.decompress(row[1]).decode("utf-8")
+
+    def set(self, url: str, page_source: str):
+        """
+        Store the source of a page, evicting least recently used pages if needed.
+        """
+        content = zlib.compress(page_source.encode("utf-8"))
+        now = time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (get_cache_key(url), get_page_type(url), url, content, len(content), now, now),
+            )
+            self._evict()
+            self._connection.commit()
+
+    def _is_expired(self, page_type: str, stored_at: float) -> bool:
+        ttl = self.ttls.get(page_type)
+        return ttl is not None and time() - stored_at > ttl
+
+    def _evict(self):
+        total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+        rows = self._connection.execute(
+            "SELECT key, size FROM pages ORDER BY last_accessed_at"
+        ).fetchall()
+        evicted_keys = []
+        for key, size in rows:
+            if total_size <= self.max_size_bytes:
+                break
+            evicted_keys.append((key,))
+            total_size -= size
+        self._connection.executemany("DELETE FROM pages WHERE key = ?", evicted_keys)
@@ -0,0 +1,106 @@
+from lxml.html import HtmlElement
+from typing import Callable, Dict, List, Union
+
+from dom import find_elements, parse_html
+from event import Event
+from match import Match, get_match_map_urls, is_skipped_match
+from match_map import MatchMap
+from player import Player
+from result import Result
+from team import Team
+
+
+def parse_results_page(source: Union[str, bytes]) -> List[Result]:
+    """
+    Parse the HTML of an HLTV results page (e.g. "/results?offset=0") into Result objects.
+    """
+    page = parse_html(source)
+    results: List[Result] = []
+    for result_div in find_elements(page, class_name="result-con"):
+        if result_div.get("data-zonedgrouping-entry-unix") == None:
+            # If the result div does not have the unix attribute, it is one
+            # of the featured results at the top of the page. Skip these.
+            continue
+        results.append(Result(result_div))
+    return results
+
+
+def parse_match_page(
+    source: Union[str, bytes], url: str, map_page_loader: Callable[[str], HtmlElement]
+) -> Match:
+    """
+    Parse the HTML of an HLTV match page into a Match object. Map stats pages
+    are requested through `map_page_loader`, which returns a parsed page for a URL.
+    """
+    return Match(page=parse_html(source), url=url, map_page_loader=map_page_loader)
+
+
+def parse_match_map_page(source: Union[str, bytes], url: str, match_id: int) -> MatchMap:
+    """
+    Parse the HTML of an HLTV match map stats page into a MatchMap object.
+    """
+    return MatchMap(page=parse_html(source), url=url, match_id=match_id)
+
+
+def parse_match_map_urls(source: Union[str, bytes]) -> List[str]:
+    """
+    Get the URLs of the map stats pages linked from the HTML of a match page.
+    Skipped matches (forfeits, showmatches, etc.) have no map stats to fetch.
+    """
+    page = parse_html(source)
+    if is_skipped_match(page):
+        return []
+    return get_match_map_urls(page)
+
+
+def parse_match_pages(match_source: Union[str, bytes], url: str, map_sources: Dict[str, str]) -> Match:
+    """
+    Parse a match page and all of its map stats pages (keyed by URL) into a
+    fully loaded Match. The result holds no parsed HTML or loader, so it can
+    be returned from a process pool.
+    """
+    return Match(
+        page=parse_html(match_source),
+        url=url,
+        map_page_loader=lambda map_url: parse_html(map_sources[map_url]),
+        prefetch_maps=True,
+    )
+
+
+def parse_match_page_without_maps(source: Union[str, bytes], url: str) -> Match:
+    """
+    Parse the HTML of a match page into a Match whose map stats pages are not
+    loaded yet; its `match_map_urls` are the pages to pass to
+    `load_match_map_pages`. The result can be passed to and from a process pool.
+    """
+    return Match(page=parse_html(source), url=url, map_page_loader=None)
+
+
+def load_match_map_pages(match: Match, map_sources: Dict[str, str]) -> Match:
+    """
+    Parse the map stats pages (keyed by URL) of a match from
+    `parse_match_page_without_maps` into it, and return the fully loaded match.
+    """
+    match.load_match_maps(lambda map_url: parse_html(map_sources[map_url]))
+    return match
+
+
+def parse_team_page(source: Union[str, bytes], url: str) -> Team:
+    """
+    Parse the HTML of an HLTV team page into a Team object.
+    """
+    return Team(page=parse_html(source), url=url)
+
+
+def parse_player_page(source: Union[str, bytes], url: str) -> Player:
+    """
+    Parse the HTML of an HLTV player page into a Player object.
+    """
+    return Player(page=parse_html(source), url=url)
+
+
+def parse_event_page(source: Union[str, bytes], url: str) -> Event:
+    """
+    Parse the HTML of an HLTV event page into an Event object.
+    """
+    return Event(page=parse_html(source), url=url)
@@ -3,6 +3,14 @@ class PickBan:
     A pick/ban made during the map pick phase.
     """
 
+    __slots__ = (
+        "hltv_match_id",
+        "pick_number",
+        "hltv_team_id",
+        "pick_type",
+        "map_name",
+    )
+
     def __init__(
         self, hltv_match_id: int, pick_number: int, hltv_team_id: int, pick_type: str, map_name: str
     ):
@@ -0,0 +1,79 @@
+import re
+from lxml.html import HtmlElement
+from typing import Optional
+
+from dom import find_element, find_elements, get_text
+from utils import get_id_from_player_url, get_id_from_team_url, intern_name
+
+
+class Player:
+    """
+    Profile information about a player, such as their nickname, real name,
+    country and current team.
+    """
+
+    __slots__ = (
+        "hltv_player_id",
+        "url",
+        "nickname",
+        "real_name",
+        "country",
+        "age",
+        "hltv_team_id",
+    )
+
+    def __init__(self, page: HtmlElement, url: str):
+        """
+        Initialize a new Player object.
+
+        Parameters
+        ----------
+        page : HtmlElement
+            The parsed HTML of HLTV's player page.
+
+        url : str
+            The URL of HLTV's player page.
+        """
+        self.hltv_player_id: int = get_id_from_player_url(url)
+        self.url: str = url
+        self.nickname: Optional[str] = intern_name(get_text(find_element(page, class_name="playerNickname")))
+        self.real_name: Optional[str] = None
+        self.country: Optional[str] = None
+        self._set_real_name_and_country(page)
+        self.age: Optional[int] = self._get_age(page)
+        self.hltv_team_id: Optional[int] = self._get_hltv_team_id(page)
+
+    def __str__(self) -> str:
+        s: str = "Player:\n"
+        for key in self.__slots__:
+            s += f"{key}: {str(getattr(self, key))}\n"
+        s += "\n"
+        return s
+
+    def _set_real_name_and_country(self, page: HtmlElement):
+        real_name_divs = find_elements(page, class_name="playerRealname")
+        if len(real_name_divs) == 0:
+            return
+        self.real_name = get_text(real_name_divs[0]) or None
+        flags = find_elements(real_name_divs[0], class_name="flag")
+        if len(flags) > 0:
+            self.country = intern_name(flags[0].get("alt"))
+
+    def _get_age(self, page: HtmlElement) -> Optional[int]:
+        # e.g. "Age 25 years"
+        age_divs = find_elements(page, class_name="playerAge")
+        if len(age_divs) == 0:
+            return None
+        age_match = re.search(r"(\d+) years", get_text(age_divs[0]))
+        return int(age_match.group(1)) if age_match is not None else None
+
+    def _get_hltv_team_id(self, page: HtmlElement) -> Optional[int]:
+        # Players without a team have no team link
+        team_divs = find_elements(page, class_name="playerTeam")
+        if len(team_divs) == 0:
+            return None
+        for team_link in find_elements(team_divs[0], tag_name="a"):
+            href = team_link.get("href", "")
+            if "/team/" in href:
+                return get_id_from_team_url(href)
+        return None
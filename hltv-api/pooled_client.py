@@ -0,0 +1,228 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from lxml.html import HtmlElement
+from queue import Queue
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from client import HltvClient
+from dom import parse_html
+from entity_registry import EntityRegistry
+from fetcher import Fetcher
+from match import Match, get_match_map_urls, is_skipped_match
+from match_map import MatchMap
+from match_map_player import MatchMapPlayer
+from metrics import Metrics
+from page_cache import PageCache
+from event import Event
+from parsers import parse_results_page
+from player import Player
+from rate_limiter import RateLimiter
+from result import Result
+from team import Team
+from utils import get_page_type, get_results_url
+
+
+class _PendingMatch:
+    """
+    A match page that has been fetched and is waiting on its map stats pages.
+    """
+
+    def __init__(self, url: str, page: HtmlElement, map_urls: List[str]):
+        self.url: str = url
+        self.page: HtmlElement = page
+        self.map_pages: Dict[str, HtmlElement] = {}
+        self.remaining: int = len(map_urls)
+
+
+class PooledHltvClient:
+    """
+    An HLTV API client that fetches pages with a pool of workers, each with
+    its own fetcher (a browser by default).
+    Match and map stats pages are fetched concurrently, subject to a global
+    request rate limit shared by every worker.
+    """
+
+    def __init__(
+        self,
+        num_workers: int = 4,
+        requests_per_second: float = 1,
+        page_load_timeout: float = 15,
+        page_cache: Optional[PageCache] = None,
+        fetcher_factory: Optional[Callable[[], Fetcher]] = None,
+        metrics: Optional[Metrics] = None,
+        registry: Optional[EntityRegistry] = None,
+        max_requests_per_second: float = 2,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        Initialize a new PooledHltvClient object.
+
+        Parameters
+        ----------
+        num_workers : int
+            Number of workers to run.
+
+        requests_per_second : float
+            Number of page requests per second across all workers to start with. The rate
+            rises after successful requests, up to `max_requests_per_second`,
+            and is lowered, with every worker paused, when HLTV fails or blocks a request.
+
+        page_load_timeout : float
+            Maximum number of seconds to wait for a page's key element to load
+            when using the default ChromeFetcher.
+
+        page_cache : Optional[PageCache]
+            Cache shared by all workers to read pages from before fetching them.
+
+        fetcher_factory : Optional[Callable[[], Fetcher]]
+            Creates the fetcher for each worker. Defaults to a ChromeFetcher per worker.
+
+        metrics : Optional[Metrics]
+            Collects timings and counters from every worker.
+
+        registry : Optional[EntityRegistry]
+            Teams, players and events shared by every worker.
+
+        max_requests_per_second : float
+            Highest rate that successful requests can raise the rate to.
+
+        rate_limiter : Optional[RateLimiter]
+            Rate limiter to use instead of creating one from the rates above.
+            Share one instance between clients to apply a global limit.
+        """
+        self.num_workers: int = num_workers
+        self.metrics: Metrics = metrics or Metrics()
+        self.registry: EntityRegistry = registry or EntityRegistry()
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(requests_per_second, max_requests_per_second=max_requests_per_second)
+        self.rate_limiter: RateLimiter = rate_limiter
+        self._clients: List[HltvClient] = []
+        self._idle_clients: "Queue[HltvClient]" = Queue()
+        for _ in range(num_workers):
+            client = HltvClient(
+                page_load_timeout=page_load_timeout,
+                rate_limiter=self.rate_limiter,
+                page_cache=page_cache,
+                fetcher=fetcher_factory() if fetcher_factory is not None else None,
+                metrics=self.metrics,
+                registry=self.registry,
+            )
+            self._clients.append(client)
+            self._idle_clients.put(client)
+        self._executor = ThreadPoolExecutor(max_workers=num_workers)
+
+    def quit(self):
+        # Pages still queued (e.g. of an abandoned get_results) are not fetched
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for client in self._clients:
+            client.quit()
+
+    def _with_client(self, call: Callable[[HltvClient], Any]) -> Any:
+        client = self._idle_clients.get()
+        try:
+            return call(client)
+        finally:
+            self._idle_clients.put(client)
+
+    def get_page_source(self, url: str, use_cache: bool = True) -> str:
+        """
+        Get the source of an HLTV page with the next idle client. See
+        HltvClient.get_page_source.
+        """
+        return self._with_client(lambda client: client.get_page_source(url, use_cache=use_cache))
+
+    def _submit(self, url: str) -> Future:
+        return self._executor.submit(self.get_page_source, url)
+
+    def get_results(self, offset_start: int = 0, offset_end: int = 0) -> List[Result]:
+        offsets = range(offset_start, offset_end + 1, 100)
+        futures = [self._submit(get_results_url(offset)) for offset in offsets]
+        results: List[Result] = []
+        for future in futures:
+            page_source = future.result()
+            with self.metrics.timer("parse", entity="results"):
+                results.extend(parse_results_page(page_source))
+        return results
+
+    def get_matches(self, match_urls: Iterable[str], max_pending_matches: Optional[int] = None) -> Iterator[Match]:
+        """
+        Fetch matches concurrently, yielding each Match as soon as its match
+        page and all of its map stats pages have been fetched. Matches are not
+        necessarily yielded in the order of `match_urls`.
+
+        At most `max_pending_matches` (twice the number of workers by default)
+        matches are fetched at a time, and new ones are started as matches are
+        yielded. Pages still queued are cancelled if fetching fails or the
+        caller stops iterating.
+        """
+        max_pending_matches = max_pending_matches or 2 * self.num_workers
+        match_url_iter = iter(match_urls)
+        # Each future maps to the match URL it belongs to and, for map stats
+        # pages, the pending match that is waiting on it.
+        futures: Dict[Future, Tuple[str, Optional[_PendingMatch]]] = {}
+        # Matches started and not yet yielded
+        pending_count = 0
+        try:
+            while True:
+                while pending_count < max_pending_matches:
+                    match_url = next(match_url_iter, None)
+                    if match_url is None:
+                        break
+                    futures[self._submit(match_url)] = (match_url, None)
+                    pending_count += 1
+                if len(futures) == 0:
+                    break
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, pending_match = futures.pop(future)
+                    page_source = future.result()
+                    with self.metrics.timer("parse_html", page_type=get_page_type(url)):
+                        page = parse_html(page_source)
+                    if pending_match is None:
+                        # Skipped matches (forfeits, showmatches, etc.) have no map stats to fetch
+                        map_urls = [] if is_skipped_match(page) else get_match_map_urls(page)
+                        pending_match = _PendingMatch(url=url, page=page, map_urls=map_urls)
+                        for map_url in map_urls:
+                            futures[self._submit(map_url)] = (map_url, pending_match)
+                    else:
+                        pending_match.map_pages[url] = page
+                        pending_match.remaining -= 1
+                    if pending_match.remaining == 0:
+                        with self.metrics.timer("parse", entity="match"):
+                            match = Match(
+                                page=pending_match.page,
+                                url=pending_match.url,
+                                map_page_loader=pending_match.map_pages.__getitem__,
+                                prefetch_maps=True,
+                            )
+                        if match.skipped:
+                            self.metrics.increment("skipped_matches")
+                        pending_count -= 1
+                        yield match
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def iter_match_records(
+        self, match_urls: Iterable[str], sides: Tuple[str, ...] = ("Both",)
+    ) -> Iterator[Tuple[Match, MatchMap, MatchMapPlayer]]:
+        """
+        Iterate over (Match, MatchMap, MatchMapPlayer) records as matches complete.
+        """
+        for match in self.get_matches(match_urls):
+            yield from match.iter_player_records(sides=sides)
+
+    def get_matches_from_results(self, offset_start: int = 0, offset_end: int = 0) -> Iterator[Match]:
+        """
+        Fetch every match listed on the results pages between the two offsets.
+        """
+        results = self.get_results(offset_start=offset_start, offset_end=offset_end)
+        return self.get_matches([result.match_url for result in results])
+
+    def get_team(self, hltv_team_id: int) -> Team:
+        return self._with_client(lambda client: client.get_team(hltv_team_id))
+
+    def get_player(self, hltv_player_id: int) -> Player:
+        return self._with_client(lambda client: client.get_player(hltv_player_id))
+
+    def get_event(self, hltv_event_id: int) -> Event:
+        return self._with_client(lambda client: client.get_event(hltv_event_id))
@@ -0,0 +1,125 @@
+import asyncio
+from random import uniform
+from threading import Lock
+from time import monotonic, sleep
+
+
+class RateLimiter:
+    """
+    Caps the rate of requests made to HLTV with a token bucket. A single
+    instance can be shared by several clients (and threads) to enforce a
+    global politeness limit.
+
+    The rate adapts to how HLTV responds: every successful request raises it
+    a little, up to `max_requests_per_second`, and every failed or blocked
+    request halves it and pauses all requests for an exponentially growing,
+    jittered backoff.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = 1,
+        min_requests_per_second: float = 0.1,
+        max_requests_per_second: float = 2,
+        burst: float = 1,
+        increase_step: float = 0.05,
+        base_backoff_seconds: float = 5,
+        max_backoff_seconds: float = 300,
+    ):
+        """
+        Initialize a new RateLimiter object.
+
+        Parameters
+        ----------
+        requests_per_second : float
+            Number of requests to allow per second to start with.
+
+        min_requests_per_second : float
+            Lowest rate that failures can reduce the rate to.
+
+        max_requests_per_second : float
+            Highest rate that successes can raise the rate to.
+
+        burst : float
+            Number of requests that can be made back to back after a quiet period.
+
+        increase_step : float
+            Requests per second added to the rate after each successful request.
+
+        base_backoff_seconds : float
+            Pause after the first failure. Doubles with each consecutive failure.
+
+        max_backoff_seconds : float
+            Longest pause after consecutive failures.
+        """
+        self.requests_per_second: float = requests_per_second
+        self.min_requests_per_second: float = min(min_requests_per_second, requests_per_second)
+        self.max_requests_per_second: float = max(max_requests_per_second, requests_per_second)
+        self.burst: float = burst
+        self.increase_step: float = increase_step
+        self.base_backoff_seconds: float = base_backoff_seconds
+        self.max_backoff_seconds: float = max_backoff_seconds
+        self.consecutive_failures: int = 0
+        self._tokens: float = burst
+        self._updated_at: float = monotonic()
+        self._blocked_until: float = 0
+        self._lock = Lock()
+
+    def _reserve(self) -> float:
+        # Take a token and return how long to wait until it is available.
+        # The bucket can go into debt so that waiting callers are queued.
+        # While requests are paused, tokens are charged from the end of the
+        # pause, so the callers waiting for it are spaced out at the current
+        # rate instead of all going at once when it ends.
+        with self._lock:
+            now = monotonic()
+            start = max(now, self._blocked_until)
+            if start > self._updated_at:
+                elapsed = start - self._updated_at
+                self._tokens = min(self.burst, self._tokens + elapsed * self.requests_per_second)
+                self._updated_at = start
+            self._tokens -= 1
+            wait_seconds = 0 if self._tokens >= 0 else -self._tokens / self.requests_per_second
+            return max(0, self._updated_at + wait_seconds - now)
+
+    def acquire(self):
+        """
+        Block until another request is allowed.
+        """
+        wait_seconds = self._reserve()
+        if wait_seconds > 0:
+            sleep(wait_seconds)
+
+    async def acquire_async(self):
+        """
+        Wait, without blocking the event loop, until another request is allowed.
+        """
+        wait_seconds = self._reserve()
+        if wait_seconds > 0:
+            await asyncio.sleep(wait_seconds)
+
+    def record_success(self):
+        """
+        Speed up a little after a successful request.
+        """
+        with self._lock:
+            self.consecutive_failures = 0
+            self.requests_per_second = min(
+                self.max_requests_per_second, self.requests_per_second + self.increase_step
+            )
+
+    def record_failure(self) -> float:
+        """
+        Slow down after a failed or blocked request. Returns the number of
+        seconds that all requests are paused for.
+        """
+        with self._lock:
+            self.consecutive_failures += 1
+            self.requests_per_second = max(self.min_requests_per_second, self.requests_per_second / 2)
+            backoff_seconds = min(
+                self.max_backoff_seconds, self.base_backoff_seconds * 2 ** (self.consecutive_failures - 1)
+            )
+            # Jitter keeps workers that failed together from retrying together
+            backoff_seconds = uniform(backoff_seconds / 2, backoff_seconds)
+            self._blocked_until = max(self._blocked_until, monotonic() + backoff_seconds)
+            return backoff_seconds
@@ -0,0 +1,30 @@
+from typing import Dict
+
+from fetcher import FetchError, Fetcher
+from page_cache import get_cache_key
+
+
+class ReplayFetcher(Fetcher):
+    """
+    Replays pages from local HTML files instead of fetching them. Match and
+    map stats pages are matched by their HLTV IDs, so the URL slugs do not
+    need to match the URLs the files were saved from.
+    """
+
+    def __init__(self, page_paths: Dict[str, str]):
+        """
+        Initialize a new ReplayFetcher object.
+
+        Parameters
+        ----------
+        page_paths : Dict[str, str]
+            Paths of saved HTML files, keyed by the URL each page was saved from.
+        """
+        self._page_paths: Dict[str, str] = {get_cache_key(url): path for url, path in page_paths.items()}
+
+    def get_page_source(self, url: str) -> str:
+        path = self._page_paths.get(get_cache_key(url))
+        if path is None:
+            raise FetchError(f"No saved page for {url}", retryable=False)
+        with open(path, encoding="utf-8") as page_file:
+            return page_file.read()
@@ -1,8 +1,8 @@
 from datetime import datetime
-from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webelement import WebElement
+from lxml.html import HtmlElement
 
-from utils import get_id_from_match_url
+from dom import find_element, find_elements, get_text
+from utils import get_id_from_match_url, intern_name
 
 
 class Result:
@@ -12,29 +12,33 @@ class Result:
     stats are contained within the Match class.
     """
 
-    def __init__(self, result_div: WebElement):
+    __slots__ = (
+        "match_url",
+        "hltv_match_id",
+        "match_date",
+        "team1_name",
+        "team2_name",
+        "team1_score",
+        "team2_score",
+    )
+
+    def __init__(self, result_div: HtmlElement):
         """
         Initialize a new Result object.
 
         Parameters
         ----------
-        driver : WebDriver
-            The Selenium WebDriver instance to use to fetch the data.
-
-        result_div : WebElement
-            The div element that contains the result information.
+        result_div : HtmlElement
+            The parsed div element that contains the result information.
         """
 
-        self.match_url = result_div.find_element(By.TAG_NAME, "a").get_attribute("href")
+        self.match_url = find_element(result_div, tag_name="a").get("href")
         self.hltv_match_id = get_id_from_match_url(self.match_url)
         self.match_date = datetime.fromtimestamp(
-            float(result_div.get_attribute("data-zonedgrouping-entry-unix")) / 1000
+            float(result_div.get("data-zonedgrouping-entry-unix")) / 1000
         )
-        self.team1_name = result_div.find_element(By.CLASS_NAME, "team1").text
-        self.team1_score = self._parse_score(result_div=result_div, team_num=1)
-        self.team2_name = result_div.find_element(By.CLASS_NAME, "team2").text
-        self.team2_score = self._parse_score(result_div=result_div, team_num=2)
-
-    def _parse_score(self, result_div: WebElement, team_num: int) -> int:
-        score_cell = result_div.find_element(By.CLASS_NAME, "result-score")
-        return int(score_cell.find_elements(By.TAG_NAME, "span")[team_num - 1].text)
+        self.team1_name = intern_name(get_text(find_element(result_div, class_name="team1")))
+        self.team2_name = intern_name(get_text(find_element(result_div, class_name="team2")))
+        score_spans = find_elements(find_element(result_div, class_name="result-score"), tag_name="span")
+        self.team1_score = int(get_text(score_spans[0]))
+        self.team2_score = int(get_text(score_spans[1]))
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from result import Result
+
+
+class ResultsCursor:
+    """
+    Watermark of the results seen by an incremental results sync.
+
+    A result's match date is when the match started, so a match that started
+    at the same time as (or before) the newest known match can still finish,
+    and be listed, later. Results within `lookback` of the newest known match
+    date are therefore only known by their match IDs; only results older than
+    that are known by their date alone.
+    """
+
+    def __init__(
+        self,
+        latest_hltv_match_id: Optional[int] = None,
+        latest_match_date: Optional[datetime] = None,
+        known_match_dates: Optional[Dict[int, datetime]] = None,
+        lookback: timedelta = timedelta(days=1),
+    ):
+        """
+        Initialize a new ResultsCursor object.
+
+        Parameters
+        ----------
+        latest_hltv_match_id : Optional[int]
+            The HLTV match ID of the newest known result.
+
+        latest_match_date : Optional[datetime]
+            The match date of the newest known result.
+
+        known_match_dates : Optional[Dict[int, datetime]]
+            Match dates of the known results within `lookback` of
+            `latest_match_date`, keyed by HLTV match ID.
+
+        lookback : timedelta
+            How long before the newest known match date a match can start and
+            still finish after it.
+        """
+        self.latest_hltv_match_id: Optional[int] = latest_hltv_match_id
+        self.latest_match_date: Optional[datetime] = latest_match_date
+        self.known_match_dates: Dict[int, datetime] = dict(known_match_dates or {})
+        self.lookback: timedelta = lookback
+
+    def is_past_window(self, result: Result) -> bool:
+        """
+        Whether a result is old enough to be known by its date alone. Results
+        are listed newest first, so a sync can stop at the first such result.
+        """
+        if self.latest_match_date is None:
+            return False
+        return result.match_date < self.latest_match_date - self.lookback
+
+    def is_known(self, result: Result) -> bool:
+        if result.hltv_match_id == self.latest_hltv_match_id or result.hltv_match_id in self.known_match_dates:
+            return True
+        return self.is_past_window(result)
+
+    def advance(self, results: Iterable[Result]) -> "ResultsCursor":
+        """
+        Get the cursor that also knows `results`.
+        """
+        match_dates = dict(self.known_match_dates)
+        latest_hltv_match_id = self.latest_hltv_match_id
+        latest_match_date = self.latest_match_date
+        for result in results:
+            match_dates[result.hltv_match_id] = result.match_date
+            if latest_match_date is None or result.match_date > latest_match_date:
+                latest_hltv_match_id = result.hltv_match_id
+                latest_match_date = result.match_date
+        if latest_match_date is not None:
+            window_start = latest_match_date - self.lookback
+            match_dates = {
+                hltv_match_id: match_date
+                for hltv_match_id, match_date in match_dates.items()
+                if match_date >= window_start
+            }
+        return ResultsCursor(
+            latest_hltv_match_id=latest_hltv_match_id,
+            latest_match_date=latest_match_date,
+            known_match_dates=match_dates,
+            lookback=self.lookback,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "latest_hltv_match_id": self.latest_hltv_match_id,
+            "latest_match_date": None if self.latest_match_date is None else self.latest_match_date.isoformat(),
+            "known_match_dates": {
+                str(hltv_match_id): match_date.isoformat()
+                for hltv_match_id, match_date in self.known_match_dates.items()
+            },
+            "lookback_seconds": self.lookback.total_seconds(),
+        }
+
+    @staticmethod
+    def from_dict(values: Dict[str, Any]) -> "ResultsCursor":
+        latest_match_date = values.get("latest_match_date")
+        return ResultsCursor(
+            latest_hltv_match_id=values.get("latest_hltv_match_id"),
+            latest_match_date=None if latest_match_date is None else datetime.fromisoformat(latest_match_date),
+            known_match_dates={
+                int(hltv_match_id): datetime.fromisoformat(match_date)
+                for hltv_match_id, match_date in values.get("known_match_dates", {}).items()
+            },
+            lookback=timedelta(seconds=values.get("lookback_seconds", timedelta(days=1).total_seconds())),
+        )
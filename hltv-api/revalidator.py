@@ -0,0 +1,165 @@
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from lxml.html import HtmlElement
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from client import HltvClient
+from dom import parse_html
+from match import Match, get_match_map_urls
+from match_map import MatchMap
+from page_cache import get_cache_key
+from result import Result
+from store import TABLES
+from utils import get_id_from_match_url
+
+# Text inside these elements changes between requests without the stats changing
+VISIBLE_TEXT_XPATH = (
+    "//body//text()[not(ancestor::script or ancestor::style or ancestor::noscript or ancestor::iframe)]"
+)
+
+
+def get_content_hash(page: HtmlElement) -> str:
+    """
+    Hash the visible text of a page, ignoring scripts, styles and whitespace,
+    so the hash only changes when the page's content does.
+    """
+    text = " ".join(" ".join(page.xpath(VISIBLE_TEXT_XPATH)).split())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class RecordChange:
+    """
+    A Match, MatchMap or MatchMapPlayer whose values changed since it was last
+    seen, with the changed fields as {field: (old value, new value)}. Records
+    seen for the first time have every field changed from None.
+    """
+
+    def __init__(self, entity: str, key: str, record: Any, changes: Dict[str, Tuple[Any, Any]]):
+        self.entity: str = entity
+        self.key: str = key
+        self.record: Any = record
+        self.changes: Dict[str, Tuple[Any, Any]] = changes
+
+
+class Revalidator:
+    """
+    Refetches recently finished matches to pick up stat corrections. A content
+    hash of every match and map stats page is kept, and only pages whose hash
+    changed are parsed again. Only records whose values changed are returned.
+    """
+
+    def __init__(self, client: HltvClient, path: str, freshness_window: timedelta = timedelta(days=7)):
+        """
+        Initialize a new Revalidator object.
+
+        Parameters
+        ----------
+        client : HltvClient
+            Client used to fetch pages. Its page cache is bypassed (and updated)
+            so that corrections are seen.
+
+        path : str
+            Path of the SQLite file the page hashes and record values are kept in.
+
+        freshness_window : timedelta
+            Only matches played within this long of now are revalidated.
+        """
+        self.client = client
+        self.freshness_window: timedelta = freshness_window
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS page_hashes (key TEXT PRIMARY KEY, content_hash TEXT, checked_at TEXT)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS record_values (key TEXT PRIMARY KEY, entity TEXT, record_values TEXT)"
+            )
+
+    def close(self):
+        self._connection.close()
+
+    def _fetch_page(self, url: str) -> Tuple[HtmlElement, str]:
+        page_source = self.client.get_page_source(url, use_cache=False)
+        page = parse_html(page_source)
+        return page, get_content_hash(page)
+
+    def _is_unchanged(self, url: str, content_hash: str) -> bool:
+        row = self._connection.execute(
+            "SELECT content_hash FROM page_hashes WHERE key = ?", (get_cache_key(url),)
+        ).fetchone()
+        return row is not None and row[0] == content_hash
+
+    def _diff(self, entity: str, key: str, record: Any, table: str) -> Optional[RecordChange]:
+        values = {name: _to_json_value(getattr(record, name)) for name in TABLES[table]}
+        row = self._connection.execute("SELECT record_values FROM record_values WHERE key = ?", (key,)).fetchone()
+        old_values = {} if row is None else json.loads(row[0])
+        changes = {
+            name: (old_values.get(name), value) for name, value in values.items() if old_values.get(name) != value
+        }
+        self._connection.execute(
+            "INSERT OR REPLACE INTO record_values (key, entity, record_values) VALUES (?, ?, ?)",
+            (key, entity, json.dumps(values)),
+        )
+        if len(changes) == 0:
+            return None
+        return RecordChange(entity=entity, key=key, record=record, changes=changes)
+
+    def _diff_match_map(self, match_map: MatchMap) -> List[RecordChange]:
+        changes = [self._diff("match_map", f"match_map:{match_map.hltv_match_map_id}", match_map, "match_maps")]
+        for side in ("Both", "T", "CT"):
+            for team_num in (1, 2):
+                for player in match_map.get_map_players(team_num=team_num, side=side):
+                    key = f"match_map_player:{player.hltv_match_map_id}:{player.hltv_player_id}:{player.side}"
+                    changes.append(self._diff("match_map_player", key, player, "match_map_players"))
+        return [change for change in changes if change is not None]
+
+    def revalidate_match(self, match_url: str) -> List[RecordChange]:
+        """
+        Refetch a match and its map stats pages, and get the records that
+        changed. Pages whose content hash is unchanged are not parsed again.
+        """
+        hltv_match_id = get_id_from_match_url(match_url)
+        page, content_hash = self._fetch_page(match_url)
+        page_hashes: List[Tuple[str, str]] = [(get_cache_key(match_url), content_hash)]
+        changes: List[RecordChange] = []
+        with self._connection:
+            if not self._is_unchanged(match_url, content_hash):
+                # The map stats pages are fetched and diffed separately below
+                match = Match(page=page, url=match_url, map_page_loader=None)
+                if not match.skipped:
+                    change = self._diff("match", f"match:{hltv_match_id}", match, "matches")
+                    if change is not None:
+                        changes.append(change)
+            for map_url in get_match_map_urls(page):
+                map_page, map_content_hash = self._fetch_page(map_url)
+                page_hashes.append((get_cache_key(map_url), map_content_hash))
+                if self._is_unchanged(map_url, map_content_hash):
+                    continue
+                match_map = MatchMap(page=map_page, url=map_url, match_id=hltv_match_id)
+                changes.extend(self._diff_match_map(match_map))
+            checked_at = datetime.now().isoformat()
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO page_hashes (key, content_hash, checked_at) VALUES (?, ?, ?)",
+                [(key, page_hash, checked_at) for key, page_hash in page_hashes],
+            )
+        return changes
+
+    def revalidate(self, results: Iterable[Result], now: Optional[datetime] = None) -> List[RecordChange]:
+        """
+        Revalidate the matches of the results played within the freshness
+        window, e.g. the results of the first few results pages.
+        """
+        cutoff = (now or datetime.now()) - self.freshness_window
+        changes: List[RecordChange] = []
+        for result in results:
+            if result.match_date >= cutoff:
+                changes.extend(self.revalidate_match(result.match_url))
+        return changes
@@ -0,0 +1,75 @@
+from typing import Dict, Optional, Tuple
+
+# Round history image names and the side and win type they stand for
+ROUND_OUTCOME_TYPES: Dict[str, Tuple[str, str]] = {
+    "t_win": ("T", "elimination"),
+    "ct_win": ("CT", "elimination"),
+    "bomb_exploded": ("T", "bomb_exploded"),
+    "bomb_defused": ("CT", "bomb_defused"),
+    "stopwatch": ("CT", "time"),
+}
+
+
+def get_round_outcome_type(image_src: str) -> Optional[Tuple[str, str]]:
+    """
+    Get the (side, win type) of a round history image, or None if the image
+    does not show a round win (e.g. "emptyHistory").
+    """
+    # e.g. "https://www.hltv.org/img/static/scoreboard/bomb_defused.svg"
+    image_name = image_src.rsplit("/", 1)[-1].split(".")[0]
+    return ROUND_OUTCOME_TYPES.get(image_name)
+
+
+class RoundOutcome:
+    """
+    The outcome of a single round of a map: which team won it, on which side
+    and how (elimination, bomb exploded, bomb defused or time).
+    """
+
+    __slots__ = (
+        "hltv_match_map_id",
+        "round_number",
+        "winner_team_num",
+        "winner_hltv_team_id",
+        "side",
+        "win_type",
+    )
+
+    def __init__(
+        self,
+        hltv_match_map_id: int,
+        round_number: int,
+        winner_team_num: int,
+        winner_hltv_team_id: Optional[int],
+        side: str,
+        win_type: str,
+    ):
+        """
+        Initialize a new RoundOutcome object.
+
+        Parameters
+        ----------
+        hltv_match_map_id : int
+            HLTV's match map ID.
+
+        round_number : int
+            The round number, starting at 1.
+
+        winner_team_num : int
+            The team number (1 or 2) of the team that won the round.
+
+        winner_hltv_team_id : Optional[int]
+            The HLTV team ID of the team that won the round.
+
+        side : str
+            The side the winning team played the round on ("T" or "CT").
+
+        win_type : str
+            How the round was won ("elimination", "bomb_exploded", "bomb_defused" or "time").
+        """
+        self.hltv_match_map_id: int = hltv_match_map_id
+        self.round_number: int = round_number
+        self.winner_team_num: int = winner_team_num
+        self.winner_hltv_team_id: Optional[int] = winner_hltv_team_id
+        self.side: str = side
+        self.win_type: str = win_type
@@ -0,0 +1,288 @@
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Sequence, Set
+
+from match import Match
+from match_map import MatchMap
+from match_map_player import MatchMapPlayer
+from pick_ban import PickBan
+from result import Result
+from round_outcome import RoundOutcome
+
+# Each table's columns and their SQLite types
+TABLES: Dict[str, Dict[str, str]] = {
+    "teams": {
+        "hltv_team_id": "INTEGER",
+        "name": "TEXT",
+    },
+    "results": {
+        "hltv_match_id": "INTEGER",
+        "match_url": "TEXT",
+        "match_date": "TEXT",
+        "team1_name": "TEXT",
+        "team1_score": "INTEGER",
+        "team2_name": "TEXT",
+        "team2_score": "INTEGER",
+    },
+    "matches": {
+        "hltv_match_id": "INTEGER",
+        "url": "TEXT",
+        "match_date": "TEXT",
+        "hltv_event_id": "INTEGER",
+        "best_of": "INTEGER",
+        "team1_name": "TEXT",
+        "team1_hltv_team_id": "INTEGER",
+        "team1_maps_won": "INTEGER",
+        "team1_world_rank": "INTEGER",
+        "team2_name": "TEXT",
+        "team2_hltv_team_id": "INTEGER",
+        "team2_maps_won": "INTEGER",
+        "team2_world_rank": "INTEGER",
+    },
+    # Forfeits, showmatches, etc., which have no stats but count as stored
+    "skipped_matches": {
+        "hltv_match_id": "INTEGER",
+        "url": "TEXT",
+    },
+    "pick_bans": {
+        "hltv_match_id": "INTEGER",
+        "pick_number": "INTEGER",
+        "hltv_team_id": "INTEGER",
+        "pick_type": "TEXT",
+        "map_name": "TEXT",
+    },
+    "match_maps": {
+        "hltv_match_map_id": "INTEGER",
+        "hltv_match_id": "INTEGER",
+        "map_number": "INTEGER",
+        "map_name": "TEXT",
+        "team1_hltv_team_id": "INTEGER",
+        "team1_rounds_won": "INTEGER",
+        "team2_hltv_team_id": "INTEGER",
+        "team2_rounds_won": "INTEGER",
+        "team1_1h_side": "TEXT",
+        "team1_1h_rounds_won": "INTEGER",
+        "team1_2h_side": "TEXT",
+        "team1_2h_rounds_won": "INTEGER",
+        "team2_1h_side": "TEXT",
+        "team2_1h_rounds_won": "INTEGER",
+        "team2_2h_side": "TEXT",
+        "team2_2h_rounds_won": "INTEGER",
+        "team1_bombs_exploded": "INTEGER",
+        "team1_bombs_defused": "INTEGER",
+        "team2_bombs_exploded": "INTEGER",
+        "team2_bombs_defused": "INTEGER",
+    },
+    "match_map_players": {
+        "hltv_match_map_id": "INTEGER",
+        "hltv_player_id": "INTEGER",
+        "side": "TEXT",
+        "hltv_team_id": "INTEGER",
+        "kills": "INTEGER",
+        "assists": "INTEGER",
+        "flash_assists": "INTEGER",
+        "deaths": "INTEGER",
+        "headshots": "INTEGER",
+        "first_kills": "INTEGER",
+        "first_deaths": "INTEGER",
+        "kast_percent": "REAL",
+        "adr": "REAL",
+        "hltv_rating": "REAL",
+    },
+    "round_outcomes": {
+        "hltv_match_map_id": "INTEGER",
+        "round_number": "INTEGER",
+        "winner_team_num": "INTEGER",
+        "winner_hltv_team_id": "INTEGER",
+        "side": "TEXT",
+        "win_type": "TEXT",
+    },
+}
+
+PRIMARY_KEYS: Dict[str, Sequence[str]] = {
+    "teams": ("hltv_team_id",),
+    "results": ("hltv_match_id",),
+    "matches": ("hltv_match_id",),
+    "skipped_matches": ("hltv_match_id",),
+    "pick_bans": ("hltv_match_id", "pick_number"),
+    "match_maps": ("hltv_match_map_id",),
+    "match_map_players": ("hltv_match_map_id", "hltv_player_id", "side"),
+    "round_outcomes": ("hltv_match_map_id", "round_number"),
+}
+
+INDEXES: Dict[str, Sequence[str]] = {
+    "results_match_date": ("results", "match_date"),
+    "matches_match_date": ("matches", "match_date"),
+    "matches_team1_hltv_team_id": ("matches", "team1_hltv_team_id"),
+    "matches_team2_hltv_team_id": ("matches", "team2_hltv_team_id"),
+    "pick_bans_hltv_team_id": ("pick_bans", "hltv_team_id"),
+    "match_maps_hltv_match_id": ("match_maps", "hltv_match_id"),
+    "match_maps_team1_hltv_team_id": ("match_maps", "team1_hltv_team_id"),
+    "match_maps_team2_hltv_team_id": ("match_maps", "team2_hltv_team_id"),
+    "match_map_players_hltv_player_id": ("match_map_players", "hltv_player_id"),
+    "match_map_players_hltv_team_id": ("match_map_players", "hltv_team_id"),
+}
+
+
+def _to_sqlite_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class SqliteStore:
+    """
+    Stores crawled entities in a SQLite database. Rows are upserted by their
+    HLTV IDs, so saving an entity again updates it in place.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize a new SqliteStore object.
+
+        Parameters
+        ----------
+        path : str
+            Path of the SQLite database file. Created if it does not exist.
+        """
+        self._connection = sqlite3.connect(path)
+        self._upsert_sql: Dict[str, str] = {}
+        with self._connection:
+            for table, columns in TABLES.items():
+                column_defs = ", ".join(f"{name} {sql_type}" for name, sql_type in columns.items())
+                primary_key = ", ".join(PRIMARY_KEYS[table])
+                self._connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ({column_defs}, PRIMARY KEY ({primary_key}))"
+                )
+                self._upsert_sql[table] = self._build_upsert_sql(table)
+            for index, (table, column) in INDEXES.items():
+                self._connection.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({column})")
+
+    def close(self):
+        self._connection.close()
+
+    def _build_upsert_sql(self, table: str) -> str:
+        columns = list(TABLES[table])
+        updates = [f"{name} = excluded.{name}" for name in columns if name not in PRIMARY_KEYS[table]]
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT ({', '.join(PRIMARY_KEYS[table])}) DO UPDATE SET {', '.join(updates)}"
+        )
+
+    def _get_rows(self, table: str, entities: Iterable[Any]) -> List[tuple]:
+        columns = list(TABLES[table])
+        return [tuple(_to_sqlite_value(getattr(entity, name)) for name in columns) for entity in entities]
+
+    def _upsert_rows(self, table: str, rows: List[tuple]):
+        if len(rows) > 0:
+            self._connection.executemany(self._upsert_sql[table], rows)
+
+    def save_results(self, results: Iterable[Result]):
+        with self._connection:
+            self._upsert_rows("results", self._get_rows("results", results))
+
+    def save_matches(self, matches: Iterable[Match]):
+        """
+        Save matches along with their teams, pick/bans, maps, round outcomes and
+        map players (both sides, T and CT), in a single transaction. Accessing the match maps fetches them if they
+        have not been loaded yet. Only the IDs of skipped matches are saved.
+        """
+        match_rows: List[tuple] = []
+        skipped_match_rows: List[tuple] = []
+        team_rows: List[tuple] = []
+        pick_ban_rows: List[tuple] = []
+        match_map_rows: List[tuple] = []
+        player_rows: List[tuple] = []
+        round_outcome_rows: List[tuple] = []
+        for match in matches:
+            if match.skipped:
+                skipped_match_rows.extend(self._get_rows("skipped_matches", [match]))
+                continue
+            match_rows.extend(self._get_rows("matches", [match]))
+            for team_num in (1, 2):
+                hltv_team_id = getattr(match, f"team{team_num}_hltv_team_id")
+                if hltv_team_id is not None:
+                    team_rows.append((hltv_team_id, getattr(match, f"team{team_num}_name")))
+            pick_ban_rows.extend(self._get_rows("pick_bans", match.pick_bans))
+            match_map_rows.extend(self._get_rows("match_maps", match.match_maps))
+            for match_map in match.match_maps:
+                round_outcome_rows.extend(self._get_rows("round_outcomes", match_map.round_outcomes))
+                for side in ("Both", "T", "CT"):
+                    for team_num in (1, 2):
+                        players = match_map.get_map_players(team_num=team_num, side=side)
+                        player_rows.extend(self._get_rows("match_map_players", players))
+        with self._connection:
+            self._upsert_rows("matches", match_rows)
+            self._upsert_rows("skipped_matches", skipped_match_rows)
+            self._upsert_rows("teams", team_rows)
+            self._upsert_rows("pick_bans", pick_ban_rows)
+            self._upsert_rows("match_maps", match_map_rows)
+            self._upsert_rows("match_map_players", player_rows)
+            self._upsert_rows("round_outcomes", round_outcome_rows)
+
+    def save_pick_bans(self, pick_bans: Iterable[PickBan]):
+        with self._connection:
+            self._upsert_rows("pick_bans", self._get_rows("pick_bans", pick_bans))
+
+    def save_match_maps(self, match_maps: Iterable[MatchMap]):
+        with self._connection:
+            self._upsert_rows("match_maps", self._get_rows("match_maps", match_maps))
+
+    def save_match_map_players(self, players: Iterable[MatchMapPlayer]):
+        with self._connection:
+            self._upsert_rows("match_map_players", self._get_rows("match_map_players", players))
+
+    def save_round_outcomes(self, round_outcomes: Iterable[RoundOutcome]):
+        with self._connection:
+            self._upsert_rows("round_outcomes", self._get_rows("round_outcomes", round_outcomes))
+
+    def _has_id(self, table: str, column: str, hltv_id: int) -> bool:
+        row = self._connection.execute(f"SELECT 1 FROM {table} WHERE {column} = ? LIMIT 1", (hltv_id,)).fetchone()
+        return row is not None
+
+    def has_match(self, hltv_match_id: int) -> bool:
+        """
+        Whether a match is stored, including skipped matches.
+        """
+        return self._has_id("matches", "hltv_match_id", hltv_match_id) or self._has_id(
+            "skipped_matches", "hltv_match_id", hltv_match_id
+        )
+
+    def has_match_map(self, hltv_match_map_id: int) -> bool:
+        return self._has_id("match_maps", "hltv_match_map_id", hltv_match_map_id)
+
+    def has_team(self, hltv_team_id: int) -> bool:
+        return self._has_id("teams", "hltv_team_id", hltv_team_id)
+
+    def has_player(self, hltv_player_id: int) -> bool:
+        return self._has_id("match_map_players", "hltv_player_id", hltv_player_id)
+
+    def get_stored_match_ids(self, hltv_match_ids: Iterable[int]) -> Set[int]:
+        """
+        Get which of the given match IDs are already stored, including skipped
+        matches, in one query per batch of IDs.
+        """
+        hltv_match_ids = list(hltv_match_ids)
+        stored_ids: Set[int] = set()
+        # Stay below SQLite's default limit on the number of query parameters
+        # (each ID is used twice)
+        batch_size = 450
+        for i in range(0, len(hltv_match_ids), batch_size):
+            batch = hltv_match_ids[i : i + batch_size]
+            placeholders = ", ".join("?" for _ in batch)
+            rows = self._connection.execute(
+                f"SELECT hltv_match_id FROM matches WHERE hltv_match_id IN ({placeholders}) "
+                f"UNION SELECT hltv_match_id FROM skipped_matches WHERE hltv_match_id IN ({placeholders})",
+                batch + batch,
+            ).fetchall()
+            stored_ids.update(row[0] for row in rows)
+        return stored_ids
+
+    def filter_new_results(self, results: Iterable[Result]) -> List[Result]:
+        """
+        Get the results whose matches are not stored yet, so only those matches
+        need to be fetched.
+        """
+        results = list(results)
+        stored_ids = self.get_stored_match_ids(result.hltv_match_id for result in results)
+        return [result for result in results if result.hltv_match_id not in stored_ids]
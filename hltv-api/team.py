@@ -0,0 +1,70 @@
+from lxml.html import HtmlElement
+from typing import List, Optional
+
+from dom import find_element, find_elements, get_text
+from utils import get_id_from_player_url, get_id_from_team_url, intern_name
+
+
+class Team:
+    """
+    Profile information about a team, such as its name, country, world
+    ranking and current players.
+    """
+
+    __slots__ = (
+        "hltv_team_id",
+        "url",
+        "name",
+        "country",
+        "world_rank",
+        "hltv_player_ids",
+    )
+
+    def __init__(self, page: HtmlElement, url: str):
+        """
+        Initialize a new Team object.
+
+        Parameters
+        ----------
+        page : HtmlElement
+            The parsed HTML of HLTV's team page.
+
+        url : str
+            The URL of HLTV's team page.
+        """
+        self.hltv_team_id: int = get_id_from_team_url(url)
+        self.url: str = url
+        self.name: Optional[str] = intern_name(get_text(find_element(page, class_name="profile-team-name")))
+        self.country: Optional[str] = self._get_country(page)
+        self.world_rank: Optional[int] = self._get_world_rank(page)
+        self.hltv_player_ids: List[int] = self._get_hltv_player_ids(page)
+
+    def __str__(self) -> str:
+        s: str = "Team:\n"
+        for key in self.__slots__:
+            s += f"{key}: {str(getattr(self, key))}\n"
+        s += "\n"
+        return s
+
+    def _get_country(self, page: HtmlElement) -> Optional[str]:
+        country_divs = find_elements(page, class_name="team-country")
+        if len(country_divs) == 0:
+            return None
+        return intern_name(get_text(country_divs[0]))
+
+    def _get_world_rank(self, page: HtmlElement) -> Optional[int]:
+        # e.g. "World ranking #3"; unranked teams show "-"
+        for stat_div in find_elements(page, class_name="profile-team-stat"):
+            stat_text = get_text(stat_div)
+            if stat_text.startswith("World ranking") and "#" in stat_text:
+                return int(stat_text.split("#")[1])
+        return None
+
+    def _get_hltv_player_ids(self, page: HtmlElement) -> List[int]:
+        hltv_player_ids: List[int] = []
+        for players_div in find_elements(page, class_name="bodyshot-team"):
+            for player_link in find_elements(players_div, tag_name="a"):
+                href = player_link.get("href", "")
+                if "/player/" in href:
+                    hltv_player_ids.append(get_id_from_player_url(href))
+        return hltv_player_ids
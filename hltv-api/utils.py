@@ -1,3 +1,7 @@
+from sys import intern
+from typing import Optional
+
+
 def get_id_from_team_url(url: str) -> int:
     # https://www.hltv.org/teams/4411/ninjas-in-pyjamas
     # https://www.hltv.org/stats/teams/9943/atk
@@ -21,5 +25,55 @@ def get_id_from_match_map_url(url: str) -> int:
 
 
 def get_id_from_player_url(url: str) -> int:
+    # https://www.hltv.org/player/16555/ax1le
     # https://www.hltv.org/stats/players/16555/ax1le
-    return int(url.split("/")[5])
+    if "stats" in url:
+        return int(url.split("/")[5])
+    return int(url.split("/")[4])
+
+
+def get_page_type(url: str) -> str:
+    # https://www.hltv.org/results?offset=100
+    # https://www.hltv.org/matches/2363127/9ine-vs-g2-blasttv-paris-major-2023-europe-rmr-b
+    # https://www.hltv.org/stats/matches/mapstatsid/154582/fnatic-vs-9ine
+    # https://www.hltv.org/team/5995/g2
+    # https://www.hltv.org/player/3741/niko
+    # https://www.hltv.org/events/7259/blast-tv-paris-major-2023-europe-rmr-b
+    if "/results" in url:
+        return "results"
+    if "/mapstatsid/" in url:
+        return "match_map"
+    if "/matches/" in url:
+        return "match"
+    if "/team/" in url:
+        return "team"
+    if "/player/" in url:
+        return "player"
+    if "/events/" in url:
+        return "event"
+    return "other"
+
+
+def get_results_url(offset: int) -> str:
+    return f"https://www.hltv.org/results?offset={offset}"
+
+
+# HLTV ignores the name slug at the end of profile URLs, so any slug will do
+def get_team_url(hltv_team_id: int) -> str:
+    return f"https://www.hltv.org/team/{hltv_team_id}/-"
+
+
+def get_player_url(hltv_player_id: int) -> str:
+    return f"https://www.hltv.org/player/{hltv_player_id}/-"
+
+
+def get_event_url(hltv_event_id: int) -> str:
+    return f"https://www.hltv.org/events/{hltv_event_id}/-"
+
+
+def intern_name(name: Optional[str]) -> Optional[str]:
+    """
+    Intern a team, player, event or map name, so records that repeat a name
+    share a single string.
+    """
+    return None if name is None else intern(name)